@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from aiohttp import ClientSession, web
+
+IO_MODEL = "acoGO! I/O"
+GATE_MODEL = "acoGO! P"
+
+
+@dataclass
+class StubConfig:
+    devices: int = 50
+    # Share of the account that are I/O boxes; the rest are gates.
+    io_ratio: float = 0.5
+    latency: float = 0.05
+    jitter: float = 0.02
+    offline_rate: float = 0.0
+    seed: int = 1
+
+
+@dataclass
+class StubStats:
+    requests: Counter = field(default_factory=Counter)
+    pushes: int = 0
+    timestamps: list[float] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.requests.values())
+
+    def since(self, started: float) -> int:
+        return sum(1 for stamp in self.timestamps if stamp >= started)
+
+
+class AcogoStubApi:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.stats = StubStats()
+        self._random = random.Random(config.seed)
+        # At least one I/O device, so push and I/O paths run at every size.
+        io_count = max(1, round(config.devices * config.io_ratio))
+        self.devices = [
+            {
+                "devId": f"io-{n}" if n < io_count else f"gate-{n}",
+                "model": IO_MODEL if n < io_count else GATE_MODEL,
+                "name": f"Device {n}",
+            }
+            for n in range(config.devices)
+        ]
+        self.outputs: dict[str, dict[str, bool]] = {}
+        self.inputs: dict[str, dict[str, bool]] = {}
+        # When set, state changes are POSTed here like the cloud's push feed.
+        self.webhook_url: str | None = None
+        self._push_session: ClientSession | None = None
+        self._push_tasks: set[asyncio.Task] = set()
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def start(self) -> str:
+        app = web.Application()
+        prefix = "/public/v2"
+        app.router.add_get(f"{prefix}/devices", self._devices)
+        app.router.add_get(f"{prefix}/devices/io/{{dev_id}}", self._io_details)
+        app.router.add_get(f"{prefix}/devices/gates/{{dev_id}}", self._gate_details)
+        app.router.add_post(f"{prefix}/devices/{{dev_id}}/orders/ez-open", self._open)
+        app.router.add_get(f"{prefix}/io/{{dev_id}}/state", self._io_state)
+        app.router.add_post(f"{prefix}/io/{{dev_id}}/out/{{number}}", self._set_output)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}{prefix}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        await asyncio.gather(*self._push_tasks, return_exceptions=True)
+        if self._push_session is not None:
+            await self._push_session.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def push(self, events: list[dict]) -> int:
+        if self.webhook_url is None:
+            return 0
+        if self._push_session is None:
+            self._push_session = ClientSession()
+        async with self._push_session.post(
+            self.webhook_url, json={"events": events}
+        ) as resp:
+            self.stats.pushes += 1
+            return resp.status
+
+    async def set_input(self, dev_id: str, number: int, state: bool) -> None:
+        # Simulate a wired input changing on the device itself.
+        self.inputs.setdefault(dev_id, {})[f"in{number}"] = state
+        await self.push([{"devId": dev_id, "inputs": {f"in{number}": state}}])
+
+    async def _respond(self, request: web.Request, name: str) -> web.Response | None:
+        self.stats.requests[name] += 1
+        self.stats.timestamps.append(time.monotonic())
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        await asyncio.sleep(delay)
+        if name in ("io_state", "gate_details") and (
+            self._random.random() < self.config.offline_rate
+        ):
+            return web.Response(status=408, text="Device offline")
+        return None
+
+    async def _devices(self, request: web.Request) -> web.Response:
+        await self._respond(request, "devices")
+        return web.json_response(self.devices)
+
+    async def _io_details(self, request: web.Request) -> web.Response:
+        await self._respond(request, "io_details")
+        dev_id = request.match_info["dev_id"]
+        details = {"deviceName": dev_id}
+        for n in range(1, 5):
+            details[f"in{n}Name"] = f"Input {n}"
+            details[f"out{n}Name"] = f"Output {n}"
+            details[f"out{n}Time"] = 0
+        return web.json_response(details)
+
+    async def _gate_details(self, request: web.Request) -> web.Response:
+        if offline := await self._respond(request, "gate_details"):
+            return offline
+        return web.json_response({"devId": request.match_info["dev_id"]})
+
+    async def _open(self, request: web.Request) -> web.Response:
+        await self._respond(request, "gate_orders")
+        return web.json_response({"status": "ok"})
+
+    async def _io_state(self, request: web.Request) -> web.Response:
+        if offline := await self._respond(request, "io_state"):
+            return offline
+        outputs = self.outputs.get(request.match_info["dev_id"], {})
+        inputs = self.inputs.get(request.match_info["dev_id"], {})
+        return web.json_response(
+            {
+                "message": {
+                    "inputs": {
+                        f"in{n}": inputs.get(f"in{n}", False) for n in range(1, 5)
+                    },
+                    "outputs": {
+                        f"out{n}": outputs.get(f"out{n}", False) for n in range(1, 5)
+                    },
+                }
+            }
+        )
+
+    async def _set_output(self, request: web.Request) -> web.Response:
+        await self._respond(request, "io_outputs")
+        payload = await request.json()
+        outputs = self.outputs.setdefault(request.match_info["dev_id"], {})
+        key = f"out{request.match_info['number']}"
+        outputs[key] = bool(payload.get("state"))
+        if self.webhook_url is not None:
+            event = {
+                "devId": request.match_info["dev_id"],
+                "outputs": {key: outputs[key]},
+            }
+            # Pushed after the write is answered, as the cloud would.
+            task = asyncio.get_running_loop().create_task(self.push([event]))
+            self._push_tasks.add(task)
+            task.add_done_callback(self._push_tasks.discard)
+        return web.json_response({"status": "ok"})
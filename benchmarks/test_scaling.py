@@ -0,0 +1,253 @@
+# Scaling benchmarks against a local stand-in for the acoGO! cloud API.
+#
+#   pytest benchmarks -s
+#
+# Environment knobs: ACOGO_BENCH_SIZES (comma separated device counts),
+# ACOGO_BENCH_LATENCY, ACOGO_BENCH_OFFLINE_RATE, ACOGO_BENCH_DURATION (seconds
+# of steady-state polling to observe) and ACOGO_BENCH_OUTPUT (append results
+# as JSON lines to this file).
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from stub_server import AcogoStubApi, StubConfig
+
+from custom_components.acogo import api
+from custom_components.acogo.const import CONF_PUSH, CONF_TOKEN, DOMAIN
+from custom_components.acogo.snapshot import input_bit
+
+SIZES = [
+    int(size)
+    for size in os.environ.get("ACOGO_BENCH_SIZES", "1,50,500,2000").split(",")
+]
+LATENCY = float(os.environ.get("ACOGO_BENCH_LATENCY", "0.05"))
+OFFLINE_RATE = float(os.environ.get("ACOGO_BENCH_OFFLINE_RATE", "0.0"))
+DURATION = float(os.environ.get("ACOGO_BENCH_DURATION", "10"))
+OUTPUT = os.environ.get("ACOGO_BENCH_OUTPUT")
+
+
+class LoopLagProbe:
+    def __init__(self, interval: float = 0.05) -> None:
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self.samples: list[float] = []
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self._interval)
+            self.samples.append(max(0.0, loop.time() - started - self._interval))
+
+    def summary(self) -> dict[str, float]:
+        if not self.samples:
+            return {"loop_lag_max_ms": 0.0, "loop_lag_p95_ms": 0.0}
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return {
+            "loop_lag_max_ms": round(ordered[-1] * 1000, 2),
+            "loop_lag_p95_ms": round(p95 * 1000, 2),
+            "loop_lag_mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        }
+
+
+class WebhookRelay:
+    # Serves /api/webhook/<id> straight into the webhook component, leaving
+    # the rest of the HA HTTP stack out of the measurement.
+    def __init__(self, hass) -> None:
+        self._hass = hass
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post("/api/webhook/{webhook_id}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}/api/webhook"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return await webhook.async_handle_webhook(
+            self._hass, request.match_info["webhook_id"], request
+        )
+
+
+async def async_wait_first_data(hass, entry, timeout: float = 120) -> bool:
+    # The first refresh runs in the background after setup returns; wait
+    # until every device has an answer (state, offline or error). False if
+    # some device still had none when the timeout ran out.
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        coordinators = [
+            *entry_data.get("io_coordinators", {}).values(),
+            *entry_data.get("gate_coordinators", {}).values(),
+        ]
+        if all(
+            not coordinator.restored
+            or coordinator.is_offline
+            or not coordinator.last_update_success
+            for coordinator in coordinators
+        ):
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+
+async def async_run_entry(hass, monkeypatch, devices: int, trace_memory: bool):
+    # One setup, first read and steady-state run of an entry. Tracing memory
+    # slows every allocation down, so it gets a pass of its own and the
+    # timings are only taken from the untraced one.
+    stub = AcogoStubApi(
+        StubConfig(devices=devices, latency=LATENCY, offline_rate=OFFLINE_RATE)
+    )
+    monkeypatch.setattr(api, "API_BASE", await stub.start())
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_TOKEN: "bench-token", "devices": stub.devices}
+    )
+    entry.add_to_hass(hass)
+
+    probe = LoopLagProbe()
+    if trace_memory:
+        tracemalloc.start()
+    else:
+        probe.start()
+    try:
+        started = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        setup_seconds = time.perf_counter() - started
+        first_data = await async_wait_first_data(hass, entry)
+        first_data_seconds = time.perf_counter() - started
+        setup_requests = stub.stats.total
+
+        steady_started = time.monotonic()
+        await asyncio.sleep(DURATION)
+        steady_requests = stub.stats.since(steady_started)
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        entities = len(hass.states.async_all())
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await probe.stop()
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await stub.stop()
+
+    if trace_memory:
+        return {"peak_memory_mib": round(peak_memory / 1024 / 1024, 2)}
+    return {
+        "setup_s": round(setup_seconds, 3),
+        "first_data_s": round(first_data_seconds, 3),
+        "first_data_timed_out": not first_data,
+        "setup_requests": setup_requests,
+        "requests_per_minute": round(steady_requests * 60 / DURATION, 1),
+        "entities": entities,
+        **probe.summary(),
+    }
+
+
+@pytest.fixture(autouse=True)
+def bench_environment(enable_custom_integrations, socket_enabled):
+    # The stand-in API listens on a real localhost socket.
+    yield
+
+
+@pytest.mark.parametrize("devices", SIZES)
+async def test_entry_scaling(hass, monkeypatch, devices):
+    timings = await async_run_entry(hass, monkeypatch, devices, trace_memory=False)
+    memory = await async_run_entry(hass, monkeypatch, devices, trace_memory=True)
+
+    result = {
+        "devices": devices,
+        "latency_s": LATENCY,
+        "offline_rate": OFFLINE_RATE,
+        **timings,
+        **memory,
+    }
+    print(f"\nacoGO! benchmark: {json.dumps(result)}")
+    if OUTPUT:
+        with open(OUTPUT, "a", encoding="utf-8") as file:
+            file.write(json.dumps(result) + "\n")
+
+    assert not result["first_data_timed_out"]
+    assert result["entities"] >= devices
+
+
+@pytest.mark.parametrize("devices", SIZES)
+async def test_push_ingestion(hass, monkeypatch, devices):
+    stub = AcogoStubApi(StubConfig(devices=devices, latency=LATENCY))
+    monkeypatch.setattr(api, "API_BASE", await stub.start())
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_TOKEN: "bench-token", "devices": stub.devices},
+        options={CONF_PUSH: True},
+    )
+    entry.add_to_hass(hass)
+    relay = WebhookRelay(hass)
+    try:
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        assert await async_wait_first_data(hass, entry)
+        stub.webhook_url = f"{await relay.start()}/{entry.data[CONF_WEBHOOK_ID]}"
+        io_devices = [
+            dev["devId"] for dev in stub.devices if dev["devId"].startswith("io")
+        ]
+
+        started = time.perf_counter()
+        polls_before = stub.stats.requests["io_state"]
+        for dev_id in io_devices:
+            await stub.set_input(dev_id, 1, True)
+        await hass.async_block_till_done()
+        push_seconds = time.perf_counter() - started
+        polls = stub.stats.requests["io_state"] - polls_before
+        coordinators = hass.data[DOMAIN][entry.entry_id].get("io_coordinators", {})
+        applied = sum(
+            1 for dev_id in io_devices if coordinators[dev_id].data.get(input_bit(1))
+        )
+    finally:
+        await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        await stub.stop()
+        await relay.stop()
+
+    result = {
+        "devices": devices,
+        "pushes": stub.stats.pushes,
+        "push_s": round(push_seconds, 3),
+        "polls_during_push": polls,
+    }
+    print(f"\nacoGO! push benchmark: {json.dumps(result)}")
+    if OUTPUT:
+        with open(OUTPUT, "a", encoding="utf-8") as file:
+            file.write(json.dumps(result) + "\n")
+
+    assert applied == len(io_devices)
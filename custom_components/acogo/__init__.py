@@ -1,18 +1,51 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
+from typing import Any
 
+from homeassistant.components import webhook
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_WEBHOOK_ID, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import AcogoApiError, AcogoClient
-from .const import CONF_TOKEN, DOMAIN
+from .commands import AcogoCommandQueue
+from .const import (
+    CONF_DEDICATED_POOL,
+    CONF_PUSH,
+    CONF_TOKEN,
+    DATA_REQUEST_SCHEDULER,
+    DEFAULT_DEDICATED_POOL,
+    DEFAULT_PUSH,
+    DOMAIN,
+    SIGNAL_DEVICES_ADDED,
+)
+from .details import (
+    DETAILS_REVALIDATE_INTERVAL,
+    AcogoDetailsCache,
+    async_remove_details_cache,
+)
+from .fairshare import AcogoRequestScheduler
+from .push import AcogoPushMonitor, async_register_webhook
+from .scheduler import AcogoIoPollScheduler
+from .services import async_setup_services
+from .state import AcogoStateStore, async_remove_state_store
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[str] = ["button", "cover", "binary_sensor"]
+PLATFORMS: list[str] = ["button", "cover", "binary_sensor", "sensor"]
+
+DEVICES_UPDATE_INTERVAL = timedelta(hours=1)
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 class AcogoCoordinator(DataUpdateCoordinator):
@@ -21,41 +54,201 @@ class AcogoCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name="acogo",
+            update_interval=DEVICES_UPDATE_INTERVAL,
         )
         self.client = client
         self.devices = []
+        self.added_devices: list[dict[str, Any]] = []
+        self.removed_devices: list[dict[str, Any]] = []
+        # Devices absent from the last refresh, kept until a second one
+        # confirms they are gone.
+        self._missing: dict[str, dict[str, Any]] = {}
 
     async def _async_update_data(self):
         try:
-            self.devices = await self.client.async_get_devices()
-            return self.devices
+            devices = await self.client.async_get_devices()
         except AcogoApiError as err:
             raise UpdateFailed(str(err)) from err
+        if not isinstance(devices, list):
+            raise UpdateFailed(f"Unexpected device list payload: {devices!r}")
+        if not devices and self.devices:
+            _LOGGER.warning("acoGO! returned no devices; keeping the known ones")
+            return self.devices
+
+        # Diff by devId so only the delta has to be set up or torn down.
+        previous = {device.get("devId"): device for device in self.devices}
+        current = {device.get("devId"): device for device in devices}
+        missing = {
+            dev_id: device
+            for dev_id, device in previous.items()
+            if dev_id not in current
+        }
+        self.added_devices = [
+            device for dev_id, device in current.items() if dev_id not in previous
+        ]
+        # One short list may be an API glitch; remove devices only once they
+        # are missing from two refreshes in a row.
+        self.removed_devices = [
+            device for dev_id, device in missing.items() if dev_id in self._missing
+        ]
+        self._missing = {
+            dev_id: device
+            for dev_id, device in missing.items()
+            if dev_id not in self._missing
+        }
+        self.devices = [*devices, *self._missing.values()]
+        return self.devices
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    session = async_get_clientsession(hass)
     token = entry.data[CONF_TOKEN]
-
-    client = AcogoClient(session, token)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    # Every entry's requests go through one scheduler, so a large account
+    # cannot starve the others or multiply the outbound connection count.
+    scheduler: AcogoRequestScheduler = domain_data.setdefault(
+        DATA_REQUEST_SCHEDULER, AcogoRequestScheduler()
+    )
+    client_options = {"scheduler": scheduler, "lane": entry.entry_id}
+    if entry.options.get(CONF_DEDICATED_POOL, DEFAULT_DEDICATED_POOL):
+        client = AcogoClient.with_dedicated_pool(token, **client_options)
+
+        async def _async_close_client(_event=None) -> None:
+            await client.async_close()
+
+        entry.async_on_unload(_async_close_client)
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_client)
+        )
+        # Connect ahead of the first command instead of on its critical path.
+        entry.async_create_background_task(
+            hass, client.async_prewarm(), f"acogo_prewarm_{entry.entry_id}"
+        )
+    else:
+        client = AcogoClient(async_get_clientsession(hass), token, **client_options)
     coordinator = AcogoCoordinator(hass, client)
 
-    # Use the device list captured during setup instead of automatic refreshes.
+    # Start from the device list stored with the entry; the periodic refresh
+    # only sets up or tears down devices that changed since.
     coordinator.devices = entry.data.get("devices", [])
     coordinator.async_set_updated_data(coordinator.devices)
 
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
+    details_cache = AcogoDetailsCache(hass, entry.entry_id)
+    await details_cache.async_load()
+    state_store = AcogoStateStore(hass, entry.entry_id)
+    await state_store.async_load()
+
+    entry_data = domain_data[entry.entry_id] = {
         "client": client,
         "coordinator": coordinator,
+        "io_scheduler": AcogoIoPollScheduler(hass, client),
+        "command_queue": AcogoCommandQueue(),
+        "details_cache": details_cache,
+        "state_store": state_store,
+        "options": dict(entry.options),
     }
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    if entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+        if CONF_WEBHOOK_ID not in entry.data:
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, CONF_WEBHOOK_ID: webhook.async_generate_id()}
+            )
+        # Created before the platforms so every coordinator follows it.
+        push = entry_data["push"] = AcogoPushMonitor(hass)
+        entry.async_on_unload(push.async_shutdown)
+        entry.async_on_unload(
+            async_register_webhook(hass, entry_data, entry.data[CONF_WEBHOOK_ID])
+        )
+
+    @callback
+    def _async_devices_updated() -> None:
+        if coordinator.added_devices:
+            _LOGGER.info(
+                "Discovered %s new acoGO! devices", len(coordinator.added_devices)
+            )
+            async_dispatcher_send(
+                hass,
+                SIGNAL_DEVICES_ADDED.format(entry.entry_id),
+                coordinator.added_devices,
+            )
+        if coordinator.removed_devices:
+            hass.async_create_task(
+                _async_remove_devices(hass, entry, coordinator.removed_devices)
+            )
+        coordinator.added_devices = []
+        coordinator.removed_devices = []
+        if coordinator.devices != entry.data.get("devices"):
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, "devices": coordinator.devices}
+            )
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_devices_updated))
+
+    async def _async_revalidate_details(_now) -> None:
+        for io_coordinator in list(entry_data.get("io_coordinators", {}).values()):
+            if io_coordinator.details_stale:
+                await io_coordinator.async_revalidate_details()
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_revalidate_details, DETAILS_REVALIDATE_INTERVAL
+        )
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_remove_devices(
+    hass: HomeAssistant, entry: ConfigEntry, devices: list[dict[str, Any]]
+) -> None:
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is None:
+        return
+    device_registry = dr.async_get(hass)
+
+    for device in devices:
+        dev_id = device.get("devId")
+        _LOGGER.info("acoGO! device %s was removed from the account", dev_id)
+        for key in ("io_coordinators", "gate_coordinators"):
+            coordinator = entry_data.get(key, {}).pop(dev_id, None)
+            if coordinator is not None:
+                await coordinator.async_shutdown()
+        entry_data["details_cache"].async_discard(dev_id)
+        entry_data["state_store"].async_discard(dev_id)
+
+        # Dropping the registry device removes its entities along with it.
+        device_entry = device_registry.async_get_device(identifiers={(DOMAIN, dev_id)})
+        if device_entry is not None:
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=entry.entry_id
+            )
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Polling bounds are read when coordinators are built, so reload on change.
+    # Device list updates are applied incrementally and must not reload.
+    entry_data = hass.data[DOMAIN].get(entry.entry_id)
+    if entry_data is not None and entry_data["options"] == dict(entry.options):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok and entry.entry_id in hass.data.get(DOMAIN, {}):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data["io_scheduler"].async_shutdown()
+        await entry_data["details_cache"].async_close()
+        await entry_data["state_store"].async_close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await async_remove_details_cache(hass, entry.entry_id)
+    await async_remove_state_store(hass, entry.entry_id)
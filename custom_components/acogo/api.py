@@ -1,9 +1,57 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 
 import aiohttp
 import async_timeout
 
+from .circuit import CircuitBreaker, CircuitState
+from .fairshare import AcogoRequestScheduler
+from .metrics import AcogoMetrics, ConnectionStats
+from .ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    AcogoRateLimiter,
+)
+from .retry import MAX_RETRIES, RetryBudget, backoff_delay
+from .session import async_prewarm, create_dedicated_session
+
 API_BASE = "https://api.aco.com.pl/public/v2"
+# public/v2 does not publish a bulk I/O state endpoint yet; set this once it does
+# and the poll scheduler will fetch all due devices with a single request.
+IO_BULK_STATE_PATH: str | None = None
+# Back-off used when a 429 response carries no usable Retry-After header.
+DEFAULT_RETRY_AFTER = 10.0
+
+# Seconds before a request is abandoned, per endpoint family. State reads are
+# cheap to repeat; commands get longer so a slow order is not sent twice.
+REQUEST_TIMEOUTS = {
+    "devices": 30.0,
+    "io_details": 15.0,
+    "gate_details": 10.0,
+    "gate_orders": 15.0,
+    "io_state": 5.0,
+    "io_outputs": 15.0,
+}
+DEFAULT_TIMEOUT = 10.0
+
+# Idempotent reads that may be hedged: when the first attempt has not answered
+# within the family's observed latency percentile, a second one is sent and
+# whichever answers first wins.
+HEDGED_FAMILIES = frozenset({"io_state"})
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.25
+
+# Methods that are safe to replay after a dropped connection. Anything else is
+# retried only when the connection failed before the request went out.
+IDEMPOTENT_METHODS = frozenset({"GET"})
 
 
 class AcogoApiError(Exception):
@@ -12,24 +60,325 @@ class AcogoApiError(Exception):
         self.status = status
 
 
+class AcogoCircuitOpenError(AcogoApiError):
+    def __init__(self, family: str, retry_after: float) -> None:
+        super().__init__(
+            f"acoGO! API {family} requests paused for {retry_after:.0f}s"
+            " after repeated failures"
+        )
+        self.family = family
+        self.retry_after = retry_after
+
+
+class AcogoRateLimitError(AcogoApiError):
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message, status=429)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float:
+    # Retry-After is either a number of seconds or an HTTP date.
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def endpoint_family(path: str) -> str:
+    # Group request paths by endpoint so per-device ids do not fragment state.
+    parts = path.strip("/").split("/")
+    if parts == ["devices"]:
+        return "devices"
+    if parts[0] == "devices" and len(parts) > 1:
+        if parts[1] == "io":
+            return "io_details"
+        if parts[1] == "gates":
+            return "gate_details"
+        if len(parts) > 2 and parts[2] == "orders":
+            return "gate_orders"
+    if parts[0] == "io" and len(parts) > 2:
+        if parts[2] == "state":
+            return "io_state"
+        if parts[2] == "out":
+            return "io_outputs"
+    return "other"
+
+
+def is_retryable(method: str, err: AcogoApiError) -> bool:
+    cause = err.__cause__
+    if method not in IDEMPOTENT_METHODS:
+        return isinstance(cause, aiohttp.ClientConnectorError)
+    # Timeouts are not retried: the attempt already used the family's budget.
+    return isinstance(cause, aiohttp.ClientConnectionError) and not isinstance(
+        cause, asyncio.TimeoutError
+    )
+
+
 class AcogoClient:
-    def __init__(self, session: aiohttp.ClientSession, token: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        token: str,
+        limiter: AcogoRateLimiter | None = None,
+        hedge_reads: bool = True,
+        scheduler: AcogoRequestScheduler | None = None,
+        lane: str = "",
+    ) -> None:
         self._session = session
         self._token = token
         self._logger = logging.getLogger(__name__)
+        # One budget per token, shared by every coordinator using this client
+        # and, through the domain scheduler, by every entry using the token.
+        if limiter is None:
+            limiter = scheduler.limiter_for(token) if scheduler else AcogoRateLimiter()
+        self._limiter = limiter
+        self._scheduler = scheduler
+        self._lane = lane
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        # Callers still waiting on each in-flight request.
+        self._waiters: dict[asyncio.Future, int] = {}
+        self.metrics = AcogoMetrics()
+        self.retry_budget = RetryBudget()
+        self._hedge_reads = hedge_reads
+        self._owns_session = False
+        # Set when the client runs on its own connection pool.
+        self.connection_stats: ConnectionStats | None = None
+
+    @classmethod
+    def with_dedicated_pool(cls, token: str, **kwargs) -> AcogoClient:
+        stats = ConnectionStats()
+        client = cls(create_dedicated_session(stats), token, **kwargs)
+        client.connection_stats = stats
+        client._owns_session = True
+        return client
+
+    async def async_prewarm(self) -> None:
+        if not self._owns_session:
+            return
+        parts = urlsplit(API_BASE)
+        await async_prewarm(self._session, f"{parts.scheme}://{parts.netloc}/")
+
+    async def async_close(self) -> None:
+        if self._owns_session:
+            await self._session.close()
+
+    def _breaker(self, family: str) -> CircuitBreaker:
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = self._breakers[family] = CircuitBreaker()
+        return breaker
+
+    def circuit_open_for(self, family: str) -> float:
+        # Seconds until requests for the endpoint family are attempted again.
+        breaker = self._breakers.get(family)
+        return breaker.retry_after if breaker else 0.0
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        priority: int = PRIORITY_POLL,
+        *,
+        coalesce: bool = True,
+        **kwargs,
+    ):
+        if method != "GET" or kwargs or not coalesce:
+            return await self._execute(method, path, priority, **kwargs)
+
+        # Identical concurrent GETs share one in-flight request and its outcome.
+        key = (method, path)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._execute(method, path, priority))
+            self._inflight[key] = future
+            future.add_done_callback(lambda fut: self._release_inflight(key, fut))
+        else:
+            self._logger.debug("acogo request joined in-flight: %s %s", method, path)
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                if not future.done():
+                    # Every caller was cancelled; nobody needs the answer.
+                    future.cancel()
+
+    def _release_inflight(self, key: tuple[str, str], future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller went away.
+            future.exception()
 
-    async def _request(self, method: str, path: str, **kwargs):
+    async def _execute(self, method: str, path: str, priority: int, **kwargs):
+        family = endpoint_family(path)
+        breaker = self._breaker(family)
+        if not breaker.allow_request():
+            self.metrics.record(family, "circuit_open")
+            raise AcogoCircuitOpenError(family, breaker.retry_after)
+
+        try:
+            result = await self._send_with_retries(
+                method, path, family, priority, **kwargs
+            )
+        except AcogoRateLimitError as err:
+            self._logger.warning(
+                "acoGO! API rate limit hit, pausing requests for %.0fs",
+                err.retry_after,
+            )
+            self._limiter.pause(err.retry_after)
+            self._record_success(breaker, family)
+            raise
+        except AcogoApiError as err:
+            if err.status is None or err.status >= 500:
+                was_open = breaker.record_failure() is CircuitState.OPEN
+                if breaker.state is CircuitState.OPEN and not was_open:
+                    self._logger.warning(
+                        "acoGO! API %s requests failing, pausing them for %.0fs",
+                        family,
+                        breaker.retry_after,
+                    )
+            else:
+                self._record_success(breaker, family)
+            raise
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+
+        self._record_success(breaker, family)
+        return result
+
+    async def _send_with_retries(
+        self, method: str, path: str, family: str, priority: int, **kwargs
+    ):
+        self.retry_budget.deposit()
+        retry = 0
+        while True:
+            await self._limiter.acquire(priority)
+            hedge_delay = self._hedge_delay(method, family)
+            try:
+                if hedge_delay is None:
+                    return await self._send(method, path, family, priority, **kwargs)
+                return await self._send_hedged(
+                    method, path, family, priority, hedge_delay, **kwargs
+                )
+            except AcogoApiError as err:
+                if (
+                    retry >= MAX_RETRIES
+                    or not is_retryable(method, err)
+                    or not self.retry_budget.withdraw()
+                ):
+                    raise
+                delay = backoff_delay(retry)
+            retry += 1
+            self.metrics.record(family, "retry")
+            self._logger.debug(
+                "acogo request retry %s in %.2fs: %s %s", retry, delay, method, path
+            )
+            await asyncio.sleep(delay)
+
+    def _record_success(self, breaker: CircuitBreaker, family: str) -> None:
+        if breaker.record_success() is not CircuitState.CLOSED:
+            self._logger.info("acoGO! API %s requests recovered", family)
+
+    def _hedge_delay(self, method: str, family: str) -> float | None:
+        if not self._hedge_reads or method != "GET" or family not in HEDGED_FAMILIES:
+            return None
+        latency = self.metrics.endpoint(family).latency
+        if latency.total < HEDGE_MIN_SAMPLES:
+            return None
+        delay = max(HEDGE_MIN_DELAY, latency.percentile(HEDGE_PERCENTILE) or 0.0)
+        if delay >= REQUEST_TIMEOUTS.get(family, DEFAULT_TIMEOUT):
+            return None
+        return delay
+
+    async def _send_hedged(
+        self,
+        method: str,
+        path: str,
+        family: str,
+        priority: int,
+        delay: float,
+        **kwargs,
+    ):
+        attempts = [
+            asyncio.ensure_future(self._send(method, path, family, priority, **kwargs))
+        ]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done:
+                await self._limiter.acquire(priority)
+                if not attempts[0].done():
+                    self._logger.debug("acogo request hedged: %s %s", method, path)
+                    self.metrics.record(family, "hedged")
+                    attempts.append(
+                        asyncio.ensure_future(
+                            self._send(method, path, family, priority, **kwargs)
+                        )
+                    )
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    err = attempt.exception()
+                    # A transport failure on one attempt leaves the other in play.
+                    if err is None or getattr(err, "status", None) is not None:
+                        return attempt.result()
+            return attempts[0].result()
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+                elif not attempt.cancelled():
+                    attempt.exception()
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        family: str = "other",
+        priority: int = PRIORITY_POLL,
+        **kwargs,
+    ):
+        if self._scheduler is None:
+            return await self._transmit(method, path, family, **kwargs)
+        # Waiting for a global slot is queueing, not request latency.
+        async with self._scheduler.slot(self._lane, priority):
+            return await self._transmit(method, path, family, **kwargs)
+
+    async def _transmit(self, method: str, path: str, family: str = "other", **kwargs):
         headers = kwargs.pop("headers", {})
         headers["Authorization"] = f"Bearer {self._token}"
         url = f"{API_BASE}{path}"
 
         self._logger.debug("acogo request start: %s %s", method, url)
 
+        self.metrics.request_started(family)
+        started = time.monotonic()
+        status: int | str = "cancelled"
         try:
-            async with async_timeout.timeout(10):
+            async with async_timeout.timeout(
+                REQUEST_TIMEOUTS.get(family, DEFAULT_TIMEOUT)
+            ):
                 async with self._session.request(
                     method, url, headers=headers, **kwargs
                 ) as resp:
+                    status = resp.status
                     self._logger.debug(
                         "acogo response status: %s %s -> %s", method, url, resp.status
                     )
@@ -46,6 +395,11 @@ class AcogoClient:
                             raise AcogoApiError(
                                 "Device offline (408)", status=resp.status
                             )
+                        if resp.status == 429:
+                            raise AcogoRateLimitError(
+                                f"429: {text}",
+                                parse_retry_after(resp.headers.get("Retry-After")),
+                            )
                         self._logger.error(
                             "acogo request failed: %s %s -> %s %s",
                             method,
@@ -66,31 +420,60 @@ class AcogoClient:
             # treat known API errors (e.g. offline).
             raise
         except Exception as err:
-            self._logger.exception("acogo request error: %s %s", method, url)
-            raise AcogoApiError(str(err)) from err
+            status = "timeout" if isinstance(err, asyncio.TimeoutError) else "error"
+            # Transport failures are expected during outages; keep the log short.
+            self._logger.warning("acogo request error: %s %s: %r", method, url, err)
+            raise AcogoApiError(str(err) or type(err).__name__) from err
+        finally:
+            self.metrics.request_finished(family, time.monotonic() - started, status)
 
     async def async_get_devices(self):
         # Example endpoint: GET /devices.
-        return await self._request("GET", "/devices")
+        return await self._request("GET", "/devices", priority=PRIORITY_BACKGROUND)
 
     async def async_open_gate(self, dev_id: str):
         # Trigger the "open gate" action.
         path = f"/devices/{dev_id}/orders/ez-open"
-        return await self._request("POST", path)
+        return await self._request("POST", path, priority=PRIORITY_COMMAND)
 
-    async def async_get_io_details(self, device_id: str):
+    async def async_get_io_details(
+        self, device_id: str, priority: int = PRIORITY_BACKGROUND
+    ):
         # Fetch details for an acoGO! I/O device.
-        return await self._request("GET", f"/devices/io/{device_id}")
+        return await self._request(
+            "GET", f"/devices/io/{device_id}", priority=priority
+        )
+
+    async def async_get_io_state(self, device_id: str, fresh: bool = False):
+        # Fetch I/O input and output states. A fresh read never joins one
+        # already in flight, which may predate a write.
+        return await self._request(
+            "GET", f"/io/{device_id}/state", coalesce=not fresh
+        )
+
+    @property
+    def supports_bulk_io_state(self) -> bool:
+        return IO_BULK_STATE_PATH is not None
 
-    async def async_get_io_state(self, device_id: str):
-        # Fetch I/O input and output states.
-        return await self._request("GET", f"/io/{device_id}/state")
+    async def async_get_io_states(self, device_ids: list[str]) -> dict:
+        # Fetch I/O states for several devices at once, keyed by device id.
+        if IO_BULK_STATE_PATH is None:
+            raise AcogoApiError("Bulk I/O state endpoint not available")
+        result = await self._request(
+            "GET", IO_BULK_STATE_PATH, params={"ids": ",".join(device_ids)}
+        )
+        if isinstance(result, dict):
+            return result.get("message") or result
+        return {}
 
     async def async_set_io_output(self, device_id: str, out_number: int, state: bool):
         # Set the state of an I/O output.
         payload = {"state": state}
         return await self._request(
-            "POST", f"/io/{device_id}/out/{out_number}", json=payload
+            "POST",
+            f"/io/{device_id}/out/{out_number}",
+            priority=PRIORITY_COMMAND,
+            json=payload,
         )
 
     async def async_get_gate_details(self, device_id: str):
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import AcogoCoordinator
 from .api import AcogoClient
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 from .io import AcogoIoCoordinator, async_get_or_create_io_coordinator
+from .snapshot import input_bit
 
 
 async def async_setup_entry(
@@ -24,22 +29,14 @@ async def async_setup_entry(
     coordinator: AcogoCoordinator = data["coordinator"]
     client: AcogoClient = data["client"]
 
-    entities: list[AcogoIoInputSensor] = []
-
-    for device in coordinator.devices:
-        if device.get("model") != "acoGO! I/O":
-            continue
-
-        try:
-            io_coordinator = await async_get_or_create_io_coordinator(
-                hass, entry.entry_id, client, device["devId"]
-            )
-        except Exception:
-            continue
-
+    async def _async_build(device: dict[str, Any]) -> list[AcogoIoInputSensor]:
+        io_coordinator = await async_get_or_create_io_coordinator(
+            hass, entry.entry_id, client, device["devId"]
+        )
         details = await io_coordinator.async_get_details()
         device_name = _get_device_name(device, details)
 
+        entities: list[AcogoIoInputSensor] = []
         for in_number in range(1, 5):
             if not _port_defined(details, "in", in_number):
                 continue
@@ -50,11 +47,38 @@ async def async_setup_entry(
                     io_coordinator, device, device_name, in_number, in_name
                 )
             )
+        return entities
+
+    async def _async_add_devices(devices: list[dict[str, Any]]) -> None:
+        # Devices are prepared concurrently; failed devices are skipped.
+        results = await asyncio.gather(
+            *(
+                _async_build(device)
+                for device in devices
+                if device.get("model") == "acoGO! I/O"
+            ),
+            return_exceptions=True,
+        )
+        async_add_entities(
+            [
+                entity
+                for result in results
+                if not isinstance(result, BaseException)
+                for entity in result
+            ]
+        )
 
-    async_add_entities(entities)
+    await _async_add_devices(coordinator.devices)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
 
 
-class AcogoIoInputSensor(CoordinatorEntity[AcogoIoCoordinator], BinarySensorEntity):
+class AcogoIoInputSensor(
+    CoordinatorEntity[AcogoIoCoordinator], BinarySensorEntity, RestoreEntity
+):
     _attr_icon = "mdi:binary-input"
 
     def __init__(
@@ -69,6 +93,10 @@ class AcogoIoInputSensor(CoordinatorEntity[AcogoIoCoordinator], BinarySensorEnti
         self._device = device
         self._dev_id = device.get("devId")
         self._in_number = in_number
+        self._bit = input_bit(in_number)
+        self._device_name = device_name
+        self._details: dict[str, Any] | None = None
+        self._restored_state: bool | None = None
 
         self._attr_name = f"{device_name} - {in_name}"
         self._attr_unique_id = f"{self._dev_id}_in_{in_number}"
@@ -80,11 +108,44 @@ class AcogoIoInputSensor(CoordinatorEntity[AcogoIoCoordinator], BinarySensorEnti
             serial_number=self._dev_id,
         )
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            return
+        # Shown until the first poll, which runs in the background, answers.
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._restored_state = last_state.state == STATE_ON
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_ports
+        if changed is not None and not changed & self._bit:
+            return
+        details = self.coordinator.details
+        if details and details is not self._details:
+            # Details were revalidated; pick up renamed ports.
+            self._details = details
+            number = self._in_number
+            in_name = details.get(f"in{number}Name") or f"Input {number}"
+            self._attr_name = f"{self._device_name} - {in_name}"
+        super()._handle_coordinator_update()
+
     @property
     def is_on(self) -> bool | None:
-        data = self.coordinator.data or {}
-        inputs = data.get("inputs") or {}
-        return inputs.get(f"in{self._in_number}")
+        data = self.coordinator.data
+        return self._restored_state if data is None else data.get(self._bit)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return {"restored": True} if self._restored else None
+
+    @property
+    def _restored(self) -> bool:
+        # Showing a state from before the restart, not yet read again.
+        data = self.coordinator.data
+        if data is None:
+            return self._restored_state is not None
+        return self.coordinator.restored and not data.offline
 
     @property
     def available(self) -> bool:
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+from functools import partial
+
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import AcogoCoordinator
 from .api import AcogoClient
-from .const import DOMAIN, SUPPORTED_GATE_MODELS
+from .commands import AcogoCommandQueue
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED, SUPPORTED_GATE_MODELS
 from .gate import AcogoGateCoordinator, async_get_or_create_gate_coordinator
 
 
@@ -22,22 +27,34 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: AcogoCoordinator = data["coordinator"]
     client: AcogoClient = data["client"]
+    commands: AcogoCommandQueue = data["command_queue"]
 
-    entities: list[AcogoOpenGateButton] = []
+    async def _async_build(dev: dict) -> AcogoOpenGateButton:
+        gate_coordinator = await async_get_or_create_gate_coordinator(
+            hass, entry.entry_id, client, dev["devId"]
+        )
+        return AcogoOpenGateButton(gate_coordinator, client, commands, dev)
 
-    # Create one button per supported gate device.
-    for dev in coordinator.devices:
-        model = dev.get("model")
-        if model in SUPPORTED_GATE_MODELS:
-            try:
-                gate_coordinator = await async_get_or_create_gate_coordinator(
-                    hass, entry.entry_id, client, dev["devId"]
-                )
-            except Exception:
-                continue
-            entities.append(AcogoOpenGateButton(gate_coordinator, client, dev))
+    async def _async_add_devices(devices: list[dict]) -> None:
+        # Create one button per supported gate device, preparing gates concurrently.
+        results = await asyncio.gather(
+            *(
+                _async_build(dev)
+                for dev in devices
+                if dev.get("model") in SUPPORTED_GATE_MODELS
+            ),
+            return_exceptions=True,
+        )
+        async_add_entities(
+            [result for result in results if not isinstance(result, BaseException)]
+        )
 
-    async_add_entities(entities)
+    await _async_add_devices(coordinator.devices)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
 
 
 class AcogoOpenGateButton(CoordinatorEntity[AcogoGateCoordinator], ButtonEntity):
@@ -47,10 +64,12 @@ class AcogoOpenGateButton(CoordinatorEntity[AcogoGateCoordinator], ButtonEntity)
         self,
         coordinator: AcogoGateCoordinator,
         client: AcogoClient,
+        commands: AcogoCommandQueue,
         device: dict,
     ) -> None:
         super().__init__(coordinator)
         self._client = client
+        self._commands = commands
         self._device = device
         self._dev_id = device.get("devId")
 
@@ -73,4 +92,10 @@ class AcogoOpenGateButton(CoordinatorEntity[AcogoGateCoordinator], ButtonEntity)
     async def async_press(self) -> None:
         if self.coordinator.is_offline:
             raise HomeAssistantError("acoGO! gate is offline.")
-        await self._client.async_open_gate(self._dev_id)
+        # Repeated presses while an open is pending or just sent collapse into it.
+        await self._commands.async_submit(
+            self._dev_id,
+            ("open_gate",),
+            partial(self._client.async_open_gate, self._dev_id),
+            on_sent=self.coordinator.async_note_activity,
+        )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from enum import StrEnum
+
+# Consecutive 5xx/transport failures that open the circuit.
+FAILURE_THRESHOLD = 5
+# Seconds an open circuit waits before letting a trial request through.
+RESET_TIMEOUT = 30.0
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        # Seconds until an open circuit will admit a trial request.
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout - self._clock())
+
+    def allow_request(self) -> bool:
+        if self._state is CircuitState.OPEN:
+            if self.retry_after > 0:
+                return False
+            self._state = CircuitState.HALF_OPEN
+        if self._state is CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> CircuitState:
+        previous = self._state
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+        return previous
+
+    def record_failure(self) -> CircuitState:
+        previous = self._state
+        self._failures += 1
+        self._trial_in_flight = False
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+        return previous
+
+    def release(self) -> None:
+        # The trial request was abandoned without an outcome.
+        self._trial_in_flight = False
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Identical commands completed this recently are treated as already done.
+COMMAND_DEDUPE_WINDOW = 2.0
+
+
+@dataclass
+class _DeviceCommands:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Keyed by target: the latest command submitted for it and its future.
+    pending: dict[Hashable, tuple[Hashable, asyncio.Future]] = field(
+        default_factory=dict
+    )
+    # Keyed by target: the last command completed for it and when.
+    completed: dict[Hashable, tuple[Hashable, float]] = field(default_factory=dict)
+    # Run once when the device has no more commands queued, e.g. one refresh.
+    drained: dict[Callable[[], None], None] = field(default_factory=dict)
+
+
+class AcogoCommandQueue:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._devices: dict[str, _DeviceCommands] = {}
+
+    async def async_submit(
+        self,
+        device_id: str,
+        command: Hashable,
+        send: Callable[[], Awaitable[Any]],
+        *,
+        target: Hashable | None = None,
+        on_sent: Callable[[], None] | None = None,
+        on_drained: Callable[[], None] | None = None,
+    ) -> None:
+        # Commands for the same target (e.g. one output) supersede each other:
+        # only a repeat of the latest one is joined or dropped.
+        if target is None:
+            target = command
+        device = self._devices.setdefault(device_id, _DeviceCommands())
+
+        pending = device.pending.get(target)
+        if pending is not None and pending[0] == command:
+            _LOGGER.debug("Joining pending %s for %s", command, device_id)
+            await asyncio.shield(pending[1])
+            return
+        completed = device.completed.get(target)
+        if (
+            pending is None
+            and completed is not None
+            and completed[0] == command
+            and self._clock() - completed[1] < COMMAND_DEDUPE_WINDOW
+        ):
+            _LOGGER.debug("Dropping repeated %s for %s", command, device_id)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        device.pending[target] = (command, future)
+        try:
+            # Writes to one device go out one at a time, in submission order.
+            async with device.lock:
+                await send()
+        except BaseException as err:
+            if isinstance(err, Exception):
+                future.set_exception(err)
+                # Joined callers re-raise it; do not also report it as unretrieved.
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result(None)
+            device.completed[target] = (command, self._clock())
+            if on_sent is not None:
+                on_sent()
+            if on_drained is not None:
+                device.drained[on_drained] = None
+        finally:
+            if device.pending.get(target) == (command, future):
+                del device.pending[target]
+            self._async_device_idle(device_id, device)
+
+    def _async_device_idle(self, device_id: str, device: _DeviceCommands) -> None:
+        if device.pending:
+            return
+        callbacks = list(device.drained)
+        device.drained.clear()
+        now = self._clock()
+        device.completed = {
+            target: completed
+            for target, completed in device.completed.items()
+            if now - completed[1] < COMMAND_DEDUPE_WINDOW
+        }
+        if not device.completed:
+            self._devices.pop(device_id, None)
+        for drained in callbacks:
+            drained()
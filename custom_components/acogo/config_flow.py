@@ -4,12 +4,27 @@ import logging
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import AcogoApiError, AcogoClient
-from .const import CONF_TOKEN, DOMAIN
+from .const import (
+    CONF_DEDICATED_POOL,
+    CONF_GATE_MAX_INTERVAL,
+    CONF_GATE_MIN_INTERVAL,
+    CONF_IO_MAX_INTERVAL,
+    CONF_IO_MIN_INTERVAL,
+    CONF_PUSH,
+    CONF_TOKEN,
+    DEFAULT_DEDICATED_POOL,
+    DEFAULT_GATE_MAX_INTERVAL,
+    DEFAULT_GATE_MIN_INTERVAL,
+    DEFAULT_IO_MAX_INTERVAL,
+    DEFAULT_IO_MIN_INTERVAL,
+    DEFAULT_PUSH,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +39,13 @@ async def _async_validate_token(hass: HomeAssistant, token: str) -> dict:
 class AcogoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        return AcogoOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         errors: dict[str, str] = {}
 
@@ -54,3 +76,61 @@ class AcogoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=schema,
             errors=errors,
         )
+
+
+class AcogoOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._config_entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if (
+                user_input[CONF_IO_MIN_INTERVAL] > user_input[CONF_IO_MAX_INTERVAL]
+                or user_input[CONF_GATE_MIN_INTERVAL]
+                > user_input[CONF_GATE_MAX_INTERVAL]
+            ):
+                errors["base"] = "invalid_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self._config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_IO_MIN_INTERVAL,
+                    default=options.get(CONF_IO_MIN_INTERVAL, DEFAULT_IO_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_IO_MAX_INTERVAL,
+                    default=options.get(CONF_IO_MAX_INTERVAL, DEFAULT_IO_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_GATE_MIN_INTERVAL,
+                    default=options.get(
+                        CONF_GATE_MIN_INTERVAL, DEFAULT_GATE_MIN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_GATE_MAX_INTERVAL,
+                    default=options.get(
+                        CONF_GATE_MAX_INTERVAL, DEFAULT_GATE_MAX_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_DEDICATED_POOL,
+                    default=options.get(CONF_DEDICATED_POOL, DEFAULT_DEDICATED_POOL),
+                ): bool,
+                vol.Required(
+                    CONF_PUSH,
+                    default=options.get(CONF_PUSH, DEFAULT_PUSH),
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=schema,
+            errors=errors,
+        )
@@ -2,6 +2,9 @@ DOMAIN = "acogo"
 
 CONF_TOKEN = "token"
 
+# Dispatched with a list of newly discovered devices; format with the entry id.
+SIGNAL_DEVICES_ADDED = f"{DOMAIN}_devices_added_{{}}"
+
 SUPPORTED_GATE_MODELS = {
     "acoGO! P",
     "acoGO! Pro",
@@ -9,3 +12,30 @@ SUPPORTED_GATE_MODELS = {
     "acoGO! 2.0 PRO WiFi",
     "Ivoo",
 }
+
+CONF_IO_MIN_INTERVAL = "io_min_interval"
+CONF_IO_MAX_INTERVAL = "io_max_interval"
+CONF_GATE_MIN_INTERVAL = "gate_min_interval"
+CONF_GATE_MAX_INTERVAL = "gate_max_interval"
+CONF_DEDICATED_POOL = "dedicated_connection_pool"
+CONF_PUSH = "push_notifications"
+
+# Adaptive polling bounds, in seconds.
+DEFAULT_IO_MIN_INTERVAL = 2
+DEFAULT_IO_MAX_INTERVAL = 60
+DEFAULT_GATE_MIN_INTERVAL = 10
+DEFAULT_GATE_MAX_INTERVAL = 300
+
+# Opt in to a connection pool tuned for the API host instead of the shared HA
+# session.
+DEFAULT_DEDICATED_POOL = False
+
+# Accept state changes pushed to a webhook and poll only as a safety net.
+DEFAULT_PUSH = False
+
+# Key in hass.data[DOMAIN] of the request scheduler shared by all entries.
+DATA_REQUEST_SCHEDULER = "request_scheduler"
+
+# Coordinators of one entry that may run their setup fetch, and separately
+# their first background read, at the same time.
+SETUP_CONCURRENCY = 10
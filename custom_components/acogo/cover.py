@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from functools import partial
 from typing import Any
 
 from homeassistant.components.cover import (
@@ -8,16 +10,21 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_OPEN
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import AcogoCoordinator
 from .api import AcogoClient
-from .const import DOMAIN
+from .commands import AcogoCommandQueue
+from .const import DOMAIN, SIGNAL_DEVICES_ADDED
 from .io import AcogoIoCoordinator, async_get_or_create_io_coordinator
+from .snapshot import output_bit
 
 
 async def async_setup_entry(
@@ -28,23 +35,16 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: AcogoCoordinator = data["coordinator"]
     client: AcogoClient = data["client"]
+    commands: AcogoCommandQueue = data["command_queue"]
 
-    entities: list[AcogoIoOutputCover] = []
-
-    for device in coordinator.devices:
-        if device.get("model") != "acoGO! I/O":
-            continue
-
-        try:
-            io_coordinator = await async_get_or_create_io_coordinator(
-                hass, entry.entry_id, client, device["devId"]
-            )
-        except Exception:
-            continue
-
+    async def _async_build(device: dict[str, Any]) -> list[AcogoIoOutputCover]:
+        io_coordinator = await async_get_or_create_io_coordinator(
+            hass, entry.entry_id, client, device["devId"]
+        )
         details = await io_coordinator.async_get_details()
         device_name = _get_device_name(device, details)
 
+        entities: list[AcogoIoOutputCover] = []
         for out_number in range(1, 5):
             if not _port_defined(details, "out", out_number):
                 continue
@@ -55,6 +55,7 @@ async def async_setup_entry(
                 AcogoIoOutputCover(
                     io_coordinator,
                     client,
+                    commands,
                     device,
                     device_name,
                     out_number,
@@ -62,11 +63,38 @@ async def async_setup_entry(
                     out_time,
                 )
             )
+        return entities
+
+    async def _async_add_devices(devices: list[dict[str, Any]]) -> None:
+        # Devices are prepared concurrently; failed devices are skipped.
+        results = await asyncio.gather(
+            *(
+                _async_build(device)
+                for device in devices
+                if device.get("model") == "acoGO! I/O"
+            ),
+            return_exceptions=True,
+        )
+        async_add_entities(
+            [
+                entity
+                for result in results
+                if not isinstance(result, BaseException)
+                for entity in result
+            ]
+        )
 
-    async_add_entities(entities)
+    await _async_add_devices(coordinator.devices)
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_DEVICES_ADDED.format(entry.entry_id), _async_add_devices
+        )
+    )
 
 
-class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
+class AcogoIoOutputCover(
+    CoordinatorEntity[AcogoIoCoordinator], CoverEntity, RestoreEntity
+):
     _attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
     _attr_device_class = CoverDeviceClass.GARAGE
 
@@ -74,6 +102,7 @@ class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
         self,
         coordinator: AcogoIoCoordinator,
         client: AcogoClient,
+        commands: AcogoCommandQueue,
         device: dict[str, Any],
         device_name: str,
         out_number: int,
@@ -82,10 +111,13 @@ class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
     ) -> None:
         super().__init__(coordinator)
         self._client = client
+        self._commands = commands
         self._device = device
         self._dev_id = device.get("devId")
         self._out_number = out_number
-        self._out_time = out_time
+        self._bit = output_bit(out_number)
+        self._details: dict[str, Any] | None = None
+        self._restored_state: bool | None = None
 
         self._attr_name = f"{out_name}"
         self._attr_unique_id = f"{self._dev_id}_out_{out_number}"
@@ -96,6 +128,10 @@ class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
             model=device.get("model", "acoGO! I/O"),
             serial_number=self._dev_id,
         )
+        self._set_out_time(out_time)
+
+    def _set_out_time(self, out_time: int) -> None:
+        self._out_time = out_time
         if self._out_time > 0:
             self._attr_supported_features = CoverEntityFeature.OPEN
         else:
@@ -103,6 +139,31 @@ class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
                 CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE
             )
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            return
+        # Shown until the first poll, which runs in the background, answers.
+        # A timed output has long since switched itself off again.
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._restored_state = (
+                self._out_time <= 0 and last_state.state == STATE_OPEN
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        changed = self.coordinator.changed_ports
+        if changed is not None and not changed & self._bit:
+            return
+        details = self.coordinator.details
+        if details and details is not self._details:
+            # Details were revalidated; pick up renamed ports and new timings.
+            self._details = details
+            number = self._out_number
+            self._attr_name = details.get(f"out{number}Name") or f"Output {number}"
+            self._set_out_time(details.get(f"out{number}Time") or 0)
+        super()._handle_coordinator_update()
+
     @property
     def is_closed(self) -> bool | None:
         state = self._current_state
@@ -110,29 +171,56 @@ class AcogoIoOutputCover(CoordinatorEntity[AcogoIoCoordinator], CoverEntity):
             return None
         return not state
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        attributes: dict[str, Any] = {}
+        if self._out_time > 0:
+            expiry = self.coordinator.output_expiry(self._out_number)
+            attributes["predicted_off"] = expiry.isoformat() if expiry else None
+        if self._restored:
+            attributes["restored"] = True
+        return attributes or None
+
+    @property
+    def _restored(self) -> bool:
+        # Showing a state from before the restart, not yet read again.
+        data = self.coordinator.data
+        if data is None:
+            return self._restored_state is not None
+        return self.coordinator.restored and not data.offline
+
     @property
     def available(self) -> bool:
         return not self.coordinator.is_offline and super().available
 
     @property
     def _current_state(self) -> bool | None:
-        data = self.coordinator.data or {}
-        outputs = data.get("outputs") or {}
-        return outputs.get(f"out{self._out_number}")
+        data = self.coordinator.data
+        return self._restored_state if data is None else data.get(self._bit)
 
     async def async_open_cover(self, **kwargs) -> None:
         if self.coordinator.is_offline:
             raise HomeAssistantError("acoGO! I/O device is offline.")
-        await self._client.async_set_io_output(self._dev_id, self._out_number, True)
-        await self.coordinator.async_refresh_state()
+        await self._async_set_output(True)
 
     async def async_close_cover(self, **kwargs) -> None:
         if self._out_time > 0:
             raise HomeAssistantError("Closing not supported for timed outputs.")
         if self.coordinator.is_offline:
             raise HomeAssistantError("acoGO! I/O device is offline.")
-        await self._client.async_set_io_output(self._dev_id, self._out_number, False)
-        await self.coordinator.async_refresh_state()
+        await self._async_set_output(False)
+
+    async def _async_set_output(self, state: bool) -> None:
+        # Writes to one box are serialized and followed by a single refresh.
+        number = self._out_number
+        await self._commands.async_submit(
+            self._dev_id,
+            ("set_output", number, state),
+            partial(self._client.async_set_io_output, self._dev_id, number, state),
+            target=("set_output", number),
+            on_sent=partial(self.coordinator.async_apply_output, number, state),
+            on_drained=self.coordinator.async_confirm_state,
+        )
 
 
 def _port_defined(details: dict[str, Any], prefix: str, number: int) -> bool:
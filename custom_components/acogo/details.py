@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+# Cached details older than this are revalidated in the background.
+DETAILS_TTL = timedelta(hours=24)
+DETAILS_REVALIDATE_INTERVAL = timedelta(hours=1)
+SAVE_DELAY = 10
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.details"
+
+
+class AcogoDetailsCache:
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._closed = False
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if isinstance(data, dict):
+            self._entries = data.get("devices") or {}
+
+    def get(self, device_id: str) -> dict[str, Any] | None:
+        entry = self._entries.get(device_id)
+        return entry["details"] if entry else None
+
+    def is_stale(self, device_id: str) -> bool:
+        entry = self._entries.get(device_id)
+        if entry is None:
+            return True
+        return time.time() - entry["fetched_at"] > DETAILS_TTL.total_seconds()
+
+    @callback
+    def async_set(self, device_id: str, details: dict[str, Any]) -> None:
+        self._entries[device_id] = {"details": details, "fetched_at": time.time()}
+        self._async_schedule_save()
+
+    @callback
+    def async_discard(self, device_id: str) -> None:
+        if self._entries.pop(device_id, None) is not None:
+            self._async_schedule_save()
+
+    async def async_close(self) -> None:
+        # Write out pending changes now; a delayed write landing after the
+        # entry was removed would recreate its file.
+        self._closed = True
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        if not self._closed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"devices": self._entries}
+
+
+async def async_remove_details_cache(hass: HomeAssistant, entry_id: str) -> None:
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_TOKEN, DATA_REQUEST_SCHEDULER, DOMAIN
+
+TO_REDACT = {CONF_TOKEN, CONF_WEBHOOK_ID}
+
+
+def _coordinator_diagnostics(coordinator) -> dict[str, Any]:
+    last_poll = coordinator.last_poll_success
+    interval = coordinator.update_interval
+    return {
+        "last_poll_success": last_poll.isoformat() if last_poll else None,
+        "last_update_success": coordinator.last_update_success,
+        "offline": coordinator.is_offline,
+        "restored": coordinator.restored,
+        "update_interval": interval.total_seconds() if interval else None,
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    client = entry_data["client"]
+    push = entry_data.get("push")
+    io_scheduler = entry_data.get("io_scheduler")
+    scheduler = hass.data[DOMAIN].get(DATA_REQUEST_SCHEDULER)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "api": client.metrics.as_dict(),
+        "connections": (
+            client.connection_stats.as_dict() if client.connection_stats else None
+        ),
+        "scheduler": scheduler.as_dict() if scheduler else None,
+        "push": push.as_dict() if push else None,
+        "io_tiers": io_scheduler.tier_counts() if io_scheduler else None,
+        "io_coordinators": {
+            device_id: {
+                **_coordinator_diagnostics(coordinator),
+                "poll_interval": coordinator.poll_interval,
+                "tier": coordinator.tier,
+                "changes_per_hour": round(coordinator.changes_per_hour, 2),
+                "state": coordinator.data.as_dict() if coordinator.data else None,
+            }
+            for device_id, coordinator in entry_data.get("io_coordinators", {}).items()
+        },
+        "gate_coordinators": {
+            device_id: _coordinator_diagnostics(coordinator)
+            for device_id, coordinator in entry_data.get(
+                "gate_coordinators", {}
+            ).items()
+        },
+    }
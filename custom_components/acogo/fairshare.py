@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .ratelimit import PRIORITY_POLL, AcogoRateLimiter
+
+# Requests in flight to the acoGO! API across every config entry.
+GLOBAL_CONCURRENCY = 16
+
+
+class AcogoRequestScheduler:
+    # Shared by all entries of the domain. Each token keeps its own rate
+    # budget; sending is capped globally and free slots go to the most urgent
+    # waiter, taking turns between entries when priorities tie.
+    def __init__(self, concurrency: int = GLOBAL_CONCURRENCY) -> None:
+        self._concurrency = concurrency
+        self._active = 0
+        self._limiters: dict[str, AcogoRateLimiter] = {}
+        self._waiters: dict[str, list[tuple[int, int, asyncio.Future[None]]]] = {}
+        self._served: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._turn = itertools.count(1)
+
+    def limiter_for(self, token: str) -> AcogoRateLimiter:
+        # Entries sharing a token share its budget, and a 429 pause outlives
+        # a reload of the entry that caused it.
+        limiter = self._limiters.get(token)
+        if limiter is None:
+            limiter = self._limiters[token] = AcogoRateLimiter()
+        return limiter
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(
+            1
+            for waiters in self._waiters.values()
+            for *_, waiter in waiters
+            if not waiter.done()
+        )
+
+    @asynccontextmanager
+    async def slot(
+        self, lane: str, priority: int = PRIORITY_POLL
+    ) -> AsyncIterator[None]:
+        await self._acquire(lane, priority)
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._dispatch()
+
+    async def _acquire(self, lane: str, priority: int) -> None:
+        if self._active < self._concurrency and not self.queued:
+            self._grant(lane)
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters.setdefault(lane, []),
+            (priority, next(self._sequence), waiter),
+        )
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just before cancellation; hand it back.
+                self._active -= 1
+                self._dispatch()
+            raise
+
+    def _grant(self, lane: str) -> None:
+        self._active += 1
+        self._served[lane] = next(self._turn)
+
+    def _next_lane(self) -> str | None:
+        best: tuple[int, int] | None = None
+        chosen = None
+        for lane, waiters in self._waiters.items():
+            while waiters and waiters[0][2].done():
+                heapq.heappop(waiters)
+            if not waiters:
+                continue
+            # Most urgent first, then the entry served longest ago.
+            rank = (waiters[0][0], self._served.get(lane, 0))
+            if best is None or rank < best:
+                best, chosen = rank, lane
+        return chosen
+
+    def _dispatch(self) -> None:
+        while self._active < self._concurrency:
+            lane = self._next_lane()
+            if lane is None:
+                break
+            _, _, waiter = heapq.heappop(self._waiters[lane])
+            if not self._waiters[lane]:
+                del self._waiters[lane]
+            self._grant(lane)
+            waiter.set_result(None)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "concurrency": self._concurrency,
+            "active": self._active,
+            "queued": {
+                lane: sum(1 for *_, waiter in waiters if not waiter.done())
+                for lane, waiters in self._waiters.items()
+            },
+            "rate_limited_tokens": sum(
+                1 for limiter in self._limiters.values() if limiter.paused_for
+            ),
+        }
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+import random
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import AcogoApiError, AcogoClient
-from .const import DOMAIN
+from .api import AcogoApiError, AcogoCircuitOpenError, AcogoClient
+from .const import DOMAIN, SETUP_CONCURRENCY
+from .polling import AdaptiveInterval, gate_interval_from_options
+from .state import SEEDED_REFRESH_SPREAD
+
+if TYPE_CHECKING:
+    from .details import AcogoDetailsCache
+    from .push import AcogoPushMonitor
+    from .state import AcogoStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,7 +28,14 @@ GATE_UPDATE_INTERVAL = timedelta(seconds=30)
 
 class AcogoGateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(
-        self, hass: HomeAssistant, client: AcogoClient, device_id: str
+        self,
+        hass: HomeAssistant,
+        client: AcogoClient,
+        device_id: str,
+        interval: AdaptiveInterval | None = None,
+        details_cache: AcogoDetailsCache | None = None,
+        push: AcogoPushMonitor | None = None,
+        state_store: AcogoStateStore | None = None,
     ) -> None:
         super().__init__(
             hass,
@@ -29,18 +46,126 @@ class AcogoGateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._client = client
         self.device_id = device_id
         self._offline = False
+        self.last_poll_success: datetime | None = None
+        self._first_refresh_task: asyncio.Task | None = None
+        self._details_cache = details_cache
+        self._interval = interval or gate_interval_from_options(
+            {}, GATE_UPDATE_INTERVAL.total_seconds()
+        )
+        self._push = push
+        self._state_store = state_store
+        self._unsub_push = (
+            push.async_add_listener(self._async_push_changed) if push else None
+        )
+        self._apply_interval()
 
     async def _async_update_data(self) -> dict[str, Any]:
         try:
             details = await self._client.async_get_gate_details(self.device_id)
+        except AcogoCircuitOpenError as err:
+            if self.data is None:
+                raise UpdateFailed(str(err)) from err
+            # The API is known to be failing; keep the last details and skip.
+            _LOGGER.debug("Skipping poll of acoGO! gate %s: %s", self.device_id, err)
+            return self.data
         except AcogoApiError as err:
             if err.status == 408:
                 self._offline = True
+                self._interval.record_offline()
+                self._apply_interval()
                 raise UpdateFailed("acoGO! gate is offline (408)") from err
             raise UpdateFailed(str(err)) from err
+        return self._handle_details(details or {})
 
+    def _handle_details(self, details: dict[str, Any]) -> dict[str, Any]:
+        if self.data is not None:
+            if self._offline or details != self.data:
+                self._interval.record_changed()
+            else:
+                self._interval.record_unchanged()
+            self._apply_interval()
+        if self._details_cache is not None and (
+            details != self._details_cache.get(self.device_id)
+            or self._details_cache.is_stale(self.device_id)
+        ):
+            self._details_cache.async_set(self.device_id, details)
         self._offline = False
-        return details or {}
+        self.last_poll_success = dt_util.utcnow()
+        if self._state_store is not None:
+            self._state_store.async_set_gate(
+                self.device_id, details, self.last_poll_success.timestamp()
+            )
+        return details
+
+    @callback
+    def async_handle_push(self, event: Mapping[str, Any]) -> None:
+        # A state change pushed through the webhook.
+        if event.get("offline"):
+            self._offline = True
+            self.async_set_update_error(UpdateFailed("acoGO! gate is offline (push)"))
+            return
+        details = event.get("details", event)
+        self.async_set_updated_data(self._handle_details(dict(details)))
+
+    @property
+    def restored(self) -> bool:
+        # No state has been read from the cloud since startup.
+        return self.last_poll_success is None
+
+    @callback
+    def async_start_first_refresh(
+        self, semaphore: asyncio.Semaphore, delay: float = 0.0
+    ) -> None:
+        self._first_refresh_task = self.hass.async_create_background_task(
+            self._async_first_refresh(semaphore, delay),
+            f"acogo_gate_first_refresh_{self.device_id}",
+        )
+
+    async def _async_first_refresh(
+        self, semaphore: asyncio.Semaphore, delay: float
+    ) -> None:
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                await self.async_refresh()
+        finally:
+            self._first_refresh_task = None
+
+    @callback
+    def _async_push_changed(self) -> None:
+        previous = self.update_interval
+        self._apply_interval()
+        if self._listeners and self.update_interval != previous:
+            self._schedule_refresh()
+
+    @callback
+    def _apply_interval(self) -> None:
+        if self._interval.boosted:
+            seconds = self._interval.current
+        else:
+            # Entities only need availability (the offline flag): check it
+            # at the slowest rate the options allow.
+            seconds = self._interval.ceiling
+        if self._push is not None:
+            seconds = self._push.stretch(seconds)
+        self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def async_note_activity(self) -> None:
+        # A command was sent to the gate; poll it quickly for a while.
+        self._interval.boost()
+        self._apply_interval()
+        if self._listeners:
+            self._schedule_refresh()
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        if self._first_refresh_task is not None:
+            self._first_refresh_task.cancel()
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
 
     @property
     def is_offline(self) -> bool:
@@ -58,14 +183,52 @@ async def async_get_or_create_gate_coordinator(
         "gate_coordinators", {}
     )
     coordinator = coordinators.get(device_id)
-    if coordinator is None:
-        coordinator = AcogoGateCoordinator(hass, client, device_id)
-        coordinators[device_id] = coordinator
-        try:
-            await coordinator.async_config_entry_first_refresh()
-        except (UpdateFailed, ConfigEntryNotReady) as err:
-            _LOGGER.warning("Initial gate refresh failed for %s: %s", device_id, err)
-            coordinator._offline = True
-            coordinator.async_set_updated_data({})
+    if coordinator is not None:
+        return coordinator
+
+    # Platforms set up in parallel share one creation task per device.
+    pending: dict[str, asyncio.Task] = entry_data.setdefault("gate_pending", {})
+    task = pending.get(device_id)
+    if task is None:
+        task = hass.async_create_task(
+            _async_create_gate_coordinator(hass, entry_data, client, device_id),
+            f"acogo_gate_setup_{device_id}",
+        )
+        pending[device_id] = task
+        task.add_done_callback(lambda _: pending.pop(device_id, None))
+    return await asyncio.shield(task)
 
+
+async def _async_create_gate_coordinator(
+    hass: HomeAssistant, entry_data: dict[str, Any], client: AcogoClient, device_id: str
+) -> AcogoGateCoordinator:
+    interval = gate_interval_from_options(
+        entry_data.get("options", {}), GATE_UPDATE_INTERVAL.total_seconds()
+    )
+    details_cache: AcogoDetailsCache | None = entry_data.get("details_cache")
+    state_store: AcogoStateStore | None = entry_data.get("state_store")
+    coordinator = AcogoGateCoordinator(
+        hass,
+        client,
+        device_id,
+        interval,
+        details_cache,
+        push=entry_data.get("push"),
+        state_store=state_store,
+    )
+    # Shares the first-read slots of I/O devices, not their setup slots.
+    semaphore: asyncio.Semaphore = entry_data.setdefault(
+        "refresh_semaphore", asyncio.Semaphore(SETUP_CONCURRENCY)
+    )
+    # Start from the last good state, else the cached details, and refresh
+    # off the startup path. Seeded gates spread their first read out. With
+    # neither, data stays None so the first read is not counted as a change.
+    seeded = state_store.get_gate(device_id) if state_store else None
+    cached = details_cache.get(device_id) if details_cache else None
+    coordinator.data = seeded if seeded is not None else cached
+    entry_data["gate_coordinators"][device_id] = coordinator
+    coordinator.async_start_first_refresh(
+        semaphore,
+        random.uniform(0, SEEDED_REFRESH_SPREAD) if seeded is not None else 0.0,
+    )
     return coordinator
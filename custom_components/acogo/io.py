@@ -1,88 +1,461 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
-from typing import Any
+import random
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import AcogoApiError, AcogoClient
-from .const import DOMAIN
+from .api import AcogoApiError, AcogoCircuitOpenError, AcogoClient
+from .const import DOMAIN, SETUP_CONCURRENCY
+from .polling import PollTier, TieredInterval, io_interval_from_options
+from .ratelimit import PRIORITY_SETUP
+from .snapshot import IoSnapshot, iter_outputs, output_bit
+from .state import SEEDED_REFRESH_SPREAD
+
+if TYPE_CHECKING:
+    from .details import AcogoDetailsCache
+    from .push import AcogoPushMonitor
+    from .scheduler import AcogoIoPollScheduler
+    from .state import AcogoStateStore
 
 _LOGGER = logging.getLogger(__name__)
 
 IO_UPDATE_INTERVAL = timedelta(seconds=5)
+# Slack after a timed output is expected to switch off before confirming it.
+TIMED_OUTPUT_GRACE = 1.0
 
 
-class AcogoIoCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+class AcogoIoCoordinator(DataUpdateCoordinator[IoSnapshot]):
     def __init__(
-        self, hass: HomeAssistant, client: AcogoClient, device_id: str
+        self,
+        hass: HomeAssistant,
+        client: AcogoClient,
+        device_id: str,
+        scheduler: AcogoIoPollScheduler | None = None,
+        interval: TieredInterval | None = None,
+        details_cache: AcogoDetailsCache | None = None,
+        push: AcogoPushMonitor | None = None,
+        state_store: AcogoStateStore | None = None,
     ) -> None:
+        # With a shared scheduler the coordinator keeps no timer of its own.
         super().__init__(
             hass,
             _LOGGER,
             name=f"acogo_io_{device_id}",
-            update_interval=IO_UPDATE_INTERVAL,
+            update_interval=None if scheduler else IO_UPDATE_INTERVAL,
+            always_update=False,
         )
         self._client = client
+        self._scheduler = scheduler
+        self._interval = interval or io_interval_from_options(
+            {}, IO_UPDATE_INTERVAL.total_seconds()
+        )
+        self._details_cache = details_cache
         self.device_id = device_id
         self.details: dict[str, Any] | None = None
+        # Port bits (see snapshot.input_bit/output_bit) that changed in the
+        # update being delivered; None means assume everything changed.
+        self.changed_ports: int | None = None
         self._offline = False
+        self._seeded = False
+        self.last_poll_success: datetime | None = None
+        self._reconcile_task: asyncio.Task | None = None
+        # Bumped for every accepted write; reads started before it are stale.
+        self._write_generation = 0
+        self._first_refresh_task: asyncio.Task | None = None
+        # Predicted switch-off times of timed outputs (out{n}Time > 0).
+        self._output_expiry: dict[int, datetime] = {}
+        self._expiry_timers: dict[int, CALLBACK_TYPE] = {}
+        # Output bits whose expiry moved since entities were last written.
+        self._expiry_changed = 0
+        self._push = push
+        self._state_store = state_store
+        self._unsub_push = (
+            push.async_add_listener(self._async_push_changed) if push else None
+        )
 
     async def async_get_details(self) -> dict[str, Any]:
+        if self.details is None and self._details_cache is not None:
+            # Stale entries are still served; revalidation runs in the background.
+            self.details = self._details_cache.get(self.device_id)
         if self.details is None:
             try:
-                self.details = await self._client.async_get_io_details(self.device_id)
+                # Entities are built from the details; serve them before polls.
+                self.details = await self._client.async_get_io_details(
+                    self.device_id, PRIORITY_SETUP
+                )
             except AcogoApiError as err:
                 _LOGGER.warning(
                     "Could not fetch IO details for %s: %s", self.device_id, err
                 )
                 self.details = {}
+            else:
+                if self._details_cache is not None:
+                    self._details_cache.async_set(self.device_id, self.details)
         return self.details
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def async_revalidate_details(self) -> None:
+        try:
+            details = await self._client.async_get_io_details(self.device_id)
+        except AcogoApiError as err:
+            _LOGGER.debug(
+                "Could not revalidate IO details for %s: %s", self.device_id, err
+            )
+            return
+
+        if self._details_cache is not None:
+            self._details_cache.async_set(self.device_id, details)
+        if details != self.details:
+            # Port names or output times changed; let entities pick them up.
+            self.details = details
+            self.async_update_listeners()
+
+    @property
+    def details_stale(self) -> bool:
+        if self._details_cache is None:
+            return False
+        return self._details_cache.is_stale(self.device_id)
+
+    @property
+    def restored(self) -> bool:
+        # No state has been read from the cloud since startup; data, if any,
+        # was seeded from storage.
+        return self.last_poll_success is None
+
+    @callback
+    def async_seed(self, data: IoSnapshot) -> None:
+        # The last good state from before the restart; restored stays set
+        # until the device is read again. Timed outputs have switched
+        # themselves off since, and no expiry is armed for them, so they
+        # start off instead.
+        timed = 0
+        for out_number in iter_outputs(data.ports):
+            if self._out_time(out_number) > 0:
+                timed |= output_bit(out_number)
+        if timed:
+            data = IoSnapshot(
+                data.ports & ~timed, data.known, data.offline, data.fetched_at
+            )
+        self.data = data
+        self._seeded = True
+
+    @callback
+    def async_start_first_refresh(self, semaphore: asyncio.Semaphore) -> None:
+        # Entities come up on their restored state; the cloud is asked off
+        # the startup path.
+        self._first_refresh_task = self.hass.async_create_background_task(
+            self._async_first_refresh(semaphore),
+            f"acogo_io_first_refresh_{self.device_id}",
+        )
+
+    async def _async_first_refresh(self, semaphore: asyncio.Semaphore) -> None:
+        try:
+            async with semaphore:
+                # A seeded state read back unchanged still has to reach the
+                # entities, to clear their restored marker.
+                self.always_update = self._seeded
+                await self.async_refresh()
+        finally:
+            self.always_update = False
+            self._seeded = False
+            self._first_refresh_task = None
+
+    @property
+    def poll_interval(self) -> float:
+        if self._push is not None:
+            return self._push.stretch(self._interval.current)
+        return self._interval.current
+
+    @property
+    def tier(self) -> PollTier:
+        return self._interval.tier
+
+    @property
+    def changes_per_hour(self) -> float:
+        return self._interval.changes_per_hour
+
+    @property
+    def has_listeners(self) -> bool:
+        return bool(self._listeners)
+
+    @property
+    def write_generation(self) -> int:
+        return self._write_generation
+
+    def _is_stale(self, generation: int) -> bool:
+        # The read started before the last write and would revert its
+        # optimistic state.
+        return generation != self._write_generation and self.data is not None
+
+    async def _async_update_data(self) -> IoSnapshot:
+        generation = self._write_generation
         try:
             state = await self._client.async_get_io_state(self.device_id)
         except AcogoApiError as err:
-            if err.status == 408:
-                self._offline = True
-                _LOGGER.debug("acoGO! I/O %s offline (408)", self.device_id)
-                return self._offline_payload()
-            raise UpdateFailed(str(err)) from err
+            return self._handle_error(err)
+        if self._is_stale(generation):
+            return self.data
+        return self._handle_state(state)
 
+    @callback
+    def async_handle_poll_result(
+        self, result: dict[str, Any] | AcogoApiError, generation: int | None = None
+    ) -> None:
+        # Apply a state fetched by the shared scheduler; generation is
+        # write_generation from when the fetch started.
+        if isinstance(result, AcogoCircuitOpenError):
+            return
+        if (
+            not isinstance(result, AcogoApiError)
+            and generation is not None
+            and self._is_stale(generation)
+        ):
+            _LOGGER.debug("Dropping stale poll of acoGO! I/O %s", self.device_id)
+            return
+        try:
+            if isinstance(result, AcogoApiError):
+                data = self._handle_error(result)
+            else:
+                data = self._handle_state(result)
+        except UpdateFailed as err:
+            self.async_set_update_error(err)
+            return
+        self._async_publish(data)
+
+    @callback
+    def _async_publish(self, data: IoSnapshot) -> None:
+        changed = None
+        if self._seeded and not self.restored:
+            # The first read after seeding; entities drop their restored marker.
+            self._seeded = False
+        elif self.data is not None and self.last_update_success:
+            changed = self.data.diff(data)
+            if changed is not None:
+                changed |= self._expiry_changed
+            if changed == 0:
+                # Nothing moved; skip notifying every entity of a no-op update.
+                return
+        # After a failed update every entity comes back, changed or not.
+        self.changed_ports = changed
+        self._expiry_changed = 0
+        try:
+            self.async_set_updated_data(data)
+        finally:
+            self.changed_ports = None
+
+    def _handle_state(self, state: dict[str, Any]) -> IoSnapshot:
+        return self._handle_snapshot(IoSnapshot.from_payload(state))
+
+    def _handle_snapshot(self, data: IoSnapshot) -> IoSnapshot:
+        if self.data is not None:
+            if self.data.diff(data) != 0:
+                self._interval.record_changed()
+            else:
+                self._interval.record_unchanged()
+            self._apply_interval()
         self._offline = False
-        return self._format_state(state)
+        self.last_poll_success = dt_util.utcnow()
+        self._async_track_timed_outputs(data)
+        if self._state_store is not None:
+            self._state_store.async_set_io(self.device_id, data)
+        return data
+
+    def _handle_error(self, err: AcogoApiError) -> IoSnapshot:
+        if isinstance(err, AcogoCircuitOpenError) and self.data is not None:
+            # The API is known to be failing; keep the last state and skip.
+            _LOGGER.debug("Skipping poll of acoGO! I/O %s: %s", self.device_id, err)
+            return self.data
+        if err.status == 408:
+            _LOGGER.debug("acoGO! I/O %s offline (408)", self.device_id)
+            return self._handle_offline()
+        raise UpdateFailed(str(err)) from err
+
+    def _handle_offline(self) -> IoSnapshot:
+        self._offline = True
+        self._async_cancel_expiry_timers()
+        self._interval.record_offline()
+        self._apply_interval()
+        return IoSnapshot.offline_snapshot()
 
-    def _format_state(
-        self, state: dict[str, Any], offline: bool = False
-    ) -> dict[str, Any]:
-        payload: dict[str, Any] = {}
-        if isinstance(state, dict):
-            payload = state.get("message") or state
+    @callback
+    def async_handle_push(self, event: Mapping[str, Any]) -> None:
+        # A state change pushed through the webhook. Events may carry only the
+        # ports that changed, so they are laid over the last known state.
+        if event.get("offline"):
+            data = self._handle_offline()
+        else:
+            update = IoSnapshot.from_payload(event)
+            if self.data is not None and not self.data.offline:
+                update = self.data.merged(update)
+            data = self._handle_snapshot(update)
+        self._async_publish(data)
+        self._async_reschedule()
 
-        return {
-            "inputs": payload.get("inputs") or {},
-            "outputs": payload.get("outputs") or {},
-            "_offline": offline,
-        }
+    @callback
+    def _async_push_changed(self) -> None:
+        self._apply_interval()
+        if self._scheduler is not None:
+            self._scheduler.async_reschedule(self.device_id)
+        elif self._listeners:
+            self._schedule_refresh()
 
-    def _offline_payload(self) -> dict[str, Any]:
-        return self._format_state({}, offline=True)
+    @callback
+    def _apply_interval(self) -> None:
+        if self._scheduler is None:
+            self.update_interval = timedelta(seconds=self.poll_interval)
+
+    @callback
+    def async_note_activity(self) -> None:
+        # A command was sent to the device; poll it quickly for a while.
+        self._interval.boost()
+        self._apply_interval()
+        if self._scheduler is not None:
+            self._scheduler.async_reschedule(self.device_id)
+        elif self._listeners:
+            self._schedule_refresh()
 
     async def async_refresh_state(self) -> None:
+        generation = self._write_generation
         try:
-            state = await self._client.async_get_io_state(self.device_id)
+            state = await self._client.async_get_io_state(self.device_id, fresh=True)
         except AcogoApiError as err:
-            if err.status == 408:
-                self._offline = True
-                _LOGGER.debug("acoGO! I/O %s offline (408)", self.device_id)
-                self.async_set_updated_data(self._offline_payload())
+            if err.status != 408:
+                raise
+            data = self._handle_error(err)
+        else:
+            if self._is_stale(generation):
+                # A later write has its own confirmation coming.
                 return
-            raise
+            data = self._handle_state(state)
 
-        self._offline = False
-        self.async_set_updated_data(self._format_state(state))
+        self._async_publish(data)
+        self._async_reschedule()
+
+    @callback
+    def async_apply_output(self, out_number: int, state: bool) -> None:
+        # The write was accepted; show its effect now. async_confirm_state
+        # reverts it if the device reports something else.
+        self._write_generation += 1
+        self.async_note_activity()
+        if state:
+            # A timed output restarts its timer on every switch-on.
+            self._async_arm_expiry(out_number)
+        if self.data is not None and not self.data.offline:
+            self._async_publish(self.data.with_port(output_bit(out_number), state))
+        self._async_publish_expiry()
+
+    @callback
+    def async_confirm_state(self) -> None:
+        # Read the real state off the caller's path, with a fresh request.
+        if self._reconcile_task is not None:
+            # A read already in flight may predate this write; start over.
+            self._reconcile_task.cancel()
+        self._reconcile_task = self.hass.async_create_background_task(
+            self._async_reconcile(), f"acogo_io_reconcile_{self.device_id}"
+        )
+
+    async def _async_reconcile(self) -> None:
+        try:
+            await self.async_refresh_state()
+        except AcogoApiError as err:
+            # The boosted poll interval picks the real state up shortly.
+            _LOGGER.debug(
+                "Could not confirm output state of %s: %s", self.device_id, err
+            )
+        finally:
+            if self._reconcile_task is asyncio.current_task():
+                self._reconcile_task = None
+
+    def output_expiry(self, out_number: int) -> datetime | None:
+        return self._output_expiry.get(out_number)
+
+    def _out_time(self, out_number: int) -> float:
+        try:
+            return float((self.details or {}).get(f"out{out_number}Time") or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    @callback
+    def _async_track_timed_outputs(self, data: IoSnapshot) -> None:
+        # Follow timed outputs switched on by anyone, not only by our commands.
+        for out_number in list(self._expiry_timers):
+            if not data.ports & output_bit(out_number):
+                self._async_clear_expiry(out_number)
+        for out_number in iter_outputs(data.ports):
+            if out_number not in self._expiry_timers:
+                self._async_arm_expiry(out_number)
+
+    @callback
+    def _async_arm_expiry(self, out_number: int) -> None:
+        out_time = self._out_time(out_number)
+        if out_time <= 0:
+            return
+        self._async_clear_expiry(out_number)
+        expiry = dt_util.utcnow() + timedelta(seconds=out_time)
+        self._output_expiry[out_number] = expiry
+        self._expiry_changed |= output_bit(out_number)
+        self._expiry_timers[out_number] = async_call_later(
+            self.hass,
+            out_time + TIMED_OUTPUT_GRACE,
+            partial(self._async_output_expired, out_number),
+        )
+
+    @callback
+    def _async_clear_expiry(self, out_number: int) -> None:
+        if self._output_expiry.pop(out_number, None) is not None:
+            self._expiry_changed |= output_bit(out_number)
+        if (cancel := self._expiry_timers.pop(out_number, None)) is not None:
+            cancel()
+
+    @callback
+    def _async_cancel_expiry_timers(self) -> None:
+        for out_number in list(self._expiry_timers):
+            self._async_clear_expiry(out_number)
+
+    @callback
+    def _async_output_expired(self, out_number: int, _now: datetime) -> None:
+        # One targeted read instead of tightening the poll interval.
+        self._expiry_timers.pop(out_number, None)
+        self._async_clear_expiry(out_number)
+        self._async_publish_expiry()
+        self.async_confirm_state()
+
+    @callback
+    def _async_publish_expiry(self) -> None:
+        # Entities show the predicted switch-off; write them when only the
+        # expiry moved and no state update carried it out.
+        if (
+            self._expiry_changed
+            and self.data is not None
+            and not self.data.offline
+            and self.last_update_success
+        ):
+            self._async_publish(self.data)
+
+    @callback
+    def _async_reschedule(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.async_reschedule(self.device_id)
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        for task in (self._reconcile_task, self._first_refresh_task):
+            if task is not None:
+                task.cancel()
+        self._async_cancel_expiry_timers()
+        if self._unsub_push is not None:
+            self._unsub_push()
+            self._unsub_push = None
+        if self._scheduler is not None:
+            self._scheduler.async_remove(self.device_id)
 
     @property
     def is_offline(self) -> bool:
@@ -100,22 +473,71 @@ async def async_get_or_create_io_coordinator(
         "io_coordinators", {}
     )
     coordinator = coordinators.get(device_id)
-    if coordinator is None:
-        coordinator = AcogoIoCoordinator(hass, client, device_id)
-        coordinators[device_id] = coordinator
+    if coordinator is not None:
+        return coordinator
+
+    # Platforms set up in parallel share one creation task per device.
+    pending: dict[str, asyncio.Task] = entry_data.setdefault("io_pending", {})
+    task = pending.get(device_id)
+    if task is None:
+        task = hass.async_create_task(
+            _async_create_io_coordinator(hass, entry_data, client, device_id),
+            f"acogo_io_setup_{device_id}",
+        )
+        pending[device_id] = task
+        task.add_done_callback(lambda _: pending.pop(device_id, None))
+    return await asyncio.shield(task)
+
+
+async def _async_create_io_coordinator(
+    hass: HomeAssistant, entry_data: dict[str, Any], client: AcogoClient, device_id: str
+) -> AcogoIoCoordinator:
+    scheduler: AcogoIoPollScheduler | None = entry_data.get("io_scheduler")
+    state_store: AcogoStateStore | None = entry_data.get("state_store")
+    interval = io_interval_from_options(
+        entry_data.get("options", {}), IO_UPDATE_INTERVAL.total_seconds()
+    )
+    coordinator = AcogoIoCoordinator(
+        hass,
+        client,
+        device_id,
+        scheduler,
+        interval,
+        details_cache=entry_data.get("details_cache"),
+        push=entry_data.get("push"),
+        state_store=state_store,
+    )
+    semaphore: asyncio.Semaphore = entry_data.setdefault(
+        "setup_semaphore", asyncio.Semaphore(SETUP_CONCURRENCY)
+    )
+    async with semaphore:
+        # Entities are built from the details. Cached ones are served at once,
+        # so only a device never seen before waits for the cloud here.
         try:
-            try:
-                await coordinator.async_get_details()
-            except AcogoApiError as err:
-                _LOGGER.warning(
-                    "Initial IO details fetch failed for %s: %s", device_id, err
-                )
-            await coordinator.async_config_entry_first_refresh()
-        except UpdateFailed as err:
-            _LOGGER.warning("Initial IO refresh failed for %s: %s", device_id, err)
-            coordinator._offline = True
-            coordinator.async_set_updated_data(
-                {"inputs": {}, "outputs": {}, "_offline": True}
+            await coordinator.async_get_details()
+        except AcogoApiError as err:
+            _LOGGER.warning(
+                "Initial IO details fetch failed for %s: %s", device_id, err
             )
 
+    seeded = state_store.get_io(device_id) if state_store else None
+    if seeded is not None:
+        coordinator.async_seed(seeded)
+
+    entry_data["io_coordinators"][device_id] = coordinator
+    # Background first reads take their own slots, so they never hold up the
+    # details fetches that entity setup waits on.
+    refresh_semaphore: asyncio.Semaphore = entry_data.setdefault(
+        "refresh_semaphore", asyncio.Semaphore(SETUP_CONCURRENCY)
+    )
+    if scheduler is None:
+        coordinator.async_start_first_refresh(refresh_semaphore)
+    elif seeded is None:
+        coordinator.async_start_first_refresh(refresh_semaphore)
+        scheduler.async_add(coordinator)
+    else:
+        # Seeded devices are read back spread out, by the batching scheduler.
+        scheduler.async_add(
+            coordinator, first_poll=random.uniform(0, SEEDED_REFRESH_SPREAD)
+        )
     return coordinator
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += 1
+        self.sum += seconds
+
+    def merge(self, other: LatencyHistogram) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total += other.total
+        self.sum += other.sum
+
+    def percentile(self, quantile: float) -> float | None:
+        # Upper bound of the bucket holding the quantile; coarse but allocation free.
+        if not self.total:
+            return None
+        rank = quantile * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(LATENCY_BUCKETS):
+                    return LATENCY_BUCKETS[index]
+                break
+        return LATENCY_BUCKETS[-1]
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {
+            f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.counts)
+        }
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.total,
+            "mean": self.sum / self.total if self.total else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class EndpointMetrics:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Keyed by HTTP status, or "timeout", "error", "circuit_open" and "retry".
+    statuses: Counter = field(default_factory=Counter)
+    in_flight: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency.as_dict(),
+            "statuses": {str(key): count for key, count in self.statuses.items()},
+            "in_flight": self.in_flight,
+        }
+
+
+class AcogoMetrics:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, family: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(family)
+        if metrics is None:
+            metrics = self.endpoints[family] = EndpointMetrics()
+        return metrics
+
+    def request_started(self, family: str) -> None:
+        self.endpoint(family).in_flight += 1
+
+    def request_finished(self, family: str, seconds: float, status: int | str) -> None:
+        metrics = self.endpoint(family)
+        metrics.in_flight -= 1
+        if status != "cancelled":
+            # Abandoned attempts (e.g. losing hedges) would skew latency low.
+            metrics.latency.observe(seconds)
+        metrics.statuses[status] += 1
+
+    def record(self, family: str, status: int | str) -> None:
+        # Outcomes that never reached the network, e.g. an open circuit.
+        self.endpoint(family).statuses[status] += 1
+
+    def count(self, *statuses: int | str) -> int:
+        return sum(
+            metrics.statuses[status]
+            for metrics in self.endpoints.values()
+            for status in statuses
+        )
+
+    @property
+    def errors(self) -> int:
+        # Transport failures and server errors; other 4xx answers are not API faults.
+        return sum(
+            count
+            for metrics in self.endpoints.values()
+            for status, count in metrics.statuses.items()
+            if status in ("timeout", "error")
+            or (isinstance(status, int) and status >= 500)
+        )
+
+    @property
+    def total_requests(self) -> int:
+        return sum(metrics.latency.total for metrics in self.endpoints.values())
+
+    @property
+    def in_flight(self) -> int:
+        return sum(metrics.in_flight for metrics in self.endpoints.values())
+
+    def latency(self) -> LatencyHistogram:
+        combined = LatencyHistogram()
+        for metrics in self.endpoints.values():
+            combined.merge(metrics.latency)
+        return combined
+
+    def as_dict(self) -> dict[str, Any]:
+        return {family: metrics.as_dict() for family, metrics in self.endpoints.items()}
+
+
+class ConnectionStats:
+    # Connection pool activity reported through an aiohttp TraceConfig.
+    def __init__(self) -> None:
+        self.created = 0
+        self.reused = 0
+        self.queued = 0
+        self.dns_lookups = 0
+        self.dns_cache_hits = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_created)
+        trace.on_connection_reuseconn.append(self._on_reused)
+        trace.on_connection_queued_start.append(self._on_queued)
+        trace.on_dns_resolvehost_end.append(self._on_dns_lookup)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        return trace
+
+    async def _on_created(self, *_args: Any) -> None:
+        self.created += 1
+
+    async def _on_reused(self, *_args: Any) -> None:
+        self.reused += 1
+
+    async def _on_queued(self, *_args: Any) -> None:
+        self.queued += 1
+
+    async def _on_dns_lookup(self, *_args: Any) -> None:
+        self.dns_lookups += 1
+
+    async def _on_dns_cache_hit(self, *_args: Any) -> None:
+        self.dns_cache_hits += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        total = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "reuse_ratio": self.reused / total if total else None,
+            "queued": self.queued,
+            "dns_lookups": self.dns_lookups,
+            "dns_cache_hits": self.dns_cache_hits,
+        }
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable, Mapping
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    CONF_GATE_MAX_INTERVAL,
+    CONF_GATE_MIN_INTERVAL,
+    CONF_IO_MAX_INTERVAL,
+    CONF_IO_MIN_INTERVAL,
+    DEFAULT_GATE_MAX_INTERVAL,
+    DEFAULT_GATE_MIN_INTERVAL,
+    DEFAULT_IO_MAX_INTERVAL,
+    DEFAULT_IO_MIN_INTERVAL,
+)
+
+# Growth factor applied after every poll that returned unchanged state.
+IDLE_BACKOFF = 1.5
+# Growth factor applied after every poll that found the device offline (408).
+OFFLINE_BACKOFF = 4.0
+# How long polling stays at the floor after a command or an observed change.
+BOOST_DURATION = 60.0
+
+# Activity tiers cap how far an I/O device's interval may back off. Rates are
+# observed state changes per hour, decayed with ACTIVITY_HALF_LIFE.
+HOT_CHANGES_PER_HOUR = 6.0
+WARM_CHANGES_PER_HOUR = 0.5
+ACTIVITY_HALF_LIFE = 3600.0
+# A device stays hot for this long after any change it showed.
+HOT_HOLD = 900.0
+HOT_CEILING = 10.0
+WARM_CEILING = 30.0
+
+
+class PollTier(StrEnum):
+    HOT = "hot"
+    WARM = "warm"
+    COLD = "cold"
+
+
+class AdaptiveInterval:
+    def __init__(
+        self,
+        base: float,
+        floor: float,
+        ceiling: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.floor = min(floor, ceiling)
+        self.ceiling = max(floor, ceiling)
+        self._base = min(max(base, self.floor), self.ceiling)
+        self._current = self._base
+        self._boost_until = 0.0
+        self._clock = clock
+
+    @property
+    def current(self) -> float:
+        return self._current
+
+    @property
+    def boosted(self) -> bool:
+        return self._clock() < self._boost_until
+
+    def boost(self) -> None:
+        # A command was sent or the state moved: watch the device closely.
+        self._current = self.floor
+        self._boost_until = self._clock() + BOOST_DURATION
+
+    def record_changed(self) -> None:
+        self.boost()
+
+    def record_unchanged(self) -> None:
+        if self.boosted:
+            return
+        self._current = min(self.ceiling, self._current * IDLE_BACKOFF)
+
+    def record_offline(self) -> None:
+        self._boost_until = 0.0
+        self._current = min(
+            self.ceiling, max(self._current, self._base) * OFFLINE_BACKOFF
+        )
+
+
+class TieredInterval(AdaptiveInterval):
+    # Tracks how often the device's state actually changes and caps the
+    # back-off accordingly: busy devices stay close, idle ones drift out to
+    # the ceiling. An observed change promotes straight to hot.
+    def __init__(
+        self,
+        base: float,
+        floor: float,
+        ceiling: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(base, floor, ceiling, clock)
+        self._activity = 0.0
+        self._activity_at = clock()
+        self._last_change: float | None = None
+        self._offline = False
+
+    @property
+    def current(self) -> float:
+        if self._offline:
+            return self._current
+        return min(self._current, self._tier_ceiling(self.tier))
+
+    @property
+    def changes_per_hour(self) -> float:
+        return self._decayed_activity() * math.log(2) * 3600 / ACTIVITY_HALF_LIFE
+
+    @property
+    def tier(self) -> PollTier:
+        if (
+            self._last_change is not None
+            and self._clock() - self._last_change < HOT_HOLD
+        ):
+            return PollTier.HOT
+        rate = self.changes_per_hour
+        if rate >= HOT_CHANGES_PER_HOUR:
+            return PollTier.HOT
+        if rate >= WARM_CHANGES_PER_HOUR:
+            return PollTier.WARM
+        return PollTier.COLD
+
+    def _tier_ceiling(self, tier: PollTier) -> float:
+        if tier is PollTier.HOT:
+            return max(self.floor, min(HOT_CEILING, self.ceiling))
+        if tier is PollTier.WARM:
+            return max(self.floor, min(WARM_CEILING, self.ceiling))
+        return self.ceiling
+
+    def _decayed_activity(self) -> float:
+        elapsed = self._clock() - self._activity_at
+        return self._activity * 0.5 ** (elapsed / ACTIVITY_HALF_LIFE)
+
+    def record_changed(self) -> None:
+        now = self._clock()
+        self._activity = self._decayed_activity() + 1
+        self._activity_at = now
+        self._last_change = now
+        self._offline = False
+        super().record_changed()
+
+    def record_unchanged(self) -> None:
+        self._offline = False
+        super().record_unchanged()
+
+    def record_offline(self) -> None:
+        self._offline = True
+        super().record_offline()
+
+
+def io_interval_from_options(options: Mapping[str, Any], base: float) -> TieredInterval:
+    return TieredInterval(
+        base,
+        options.get(CONF_IO_MIN_INTERVAL, DEFAULT_IO_MIN_INTERVAL),
+        options.get(CONF_IO_MAX_INTERVAL, DEFAULT_IO_MAX_INTERVAL),
+    )
+
+
+def gate_interval_from_options(
+    options: Mapping[str, Any], base: float
+) -> AdaptiveInterval:
+    return AdaptiveInterval(
+        base,
+        options.get(CONF_GATE_MIN_INTERVAL, DEFAULT_GATE_MIN_INTERVAL),
+        options.get(CONF_GATE_MAX_INTERVAL, DEFAULT_GATE_MAX_INTERVAL),
+    )
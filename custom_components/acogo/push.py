@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from functools import partial
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import web
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Poll rate, in seconds, while pushes arrive; polls then only catch lost events.
+PUSH_SAFETY_INTERVAL = 900
+# Pushes are considered to have stopped after this long without one.
+PUSH_STALE_AFTER = 600
+
+
+class AcogoPushMonitor:
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self.active = False
+        self.last_push: datetime | None = None
+        self.events = 0
+        self._listeners: list[CALLBACK_TYPE] = []
+        self._unsub_stale: CALLBACK_TYPE | None = None
+
+    def stretch(self, seconds: float) -> float:
+        if not self.active:
+            return seconds
+        return max(seconds, PUSH_SAFETY_INTERVAL)
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return _remove_listener
+
+    @callback
+    def async_record_push(self, events: int = 1) -> None:
+        self.last_push = dt_util.utcnow()
+        self.events += events
+        self._cancel_stale_timer()
+        self._unsub_stale = async_call_later(
+            self.hass, PUSH_STALE_AFTER, self._async_push_stale
+        )
+        if not self.active:
+            _LOGGER.debug("acoGO! pushes arriving, slowing polls down")
+            self.active = True
+            self._async_notify()
+
+    @callback
+    def _async_push_stale(self, _now: datetime) -> None:
+        self._unsub_stale = None
+        _LOGGER.debug("No acoGO! pushes for %ss, resuming fast polls", PUSH_STALE_AFTER)
+        self.active = False
+        self._async_notify()
+
+    @callback
+    def _async_notify(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def _cancel_stale_timer(self) -> None:
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._cancel_stale_timer()
+        self._listeners.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "last_push": self.last_push.isoformat() if self.last_push else None,
+            "events": self.events,
+        }
+
+
+def _iter_events(payload: Any) -> list[Mapping[str, Any]]:
+    # One event, a list of them, or {"events": [...]}.
+    if isinstance(payload, Mapping) and "events" in payload:
+        payload = payload["events"]
+    if isinstance(payload, Mapping):
+        payload = [payload]
+    if not isinstance(payload, list):
+        return []
+    return [event for event in payload if isinstance(event, Mapping)]
+
+
+@callback
+def async_apply_push(entry_data: dict[str, Any], payload: Any) -> int:
+    applied = 0
+    for event in _iter_events(payload):
+        dev_id = event.get("devId")
+        coordinator = entry_data.get("io_coordinators", {}).get(
+            dev_id
+        ) or entry_data.get("gate_coordinators", {}).get(dev_id)
+        if coordinator is None:
+            _LOGGER.debug("Ignoring acoGO! push for unknown device %s", dev_id)
+            continue
+        coordinator.async_handle_push(event)
+        applied += 1
+    return applied
+
+
+async def _async_handle_webhook(
+    entry_data: dict[str, Any],
+    hass: HomeAssistant,
+    webhook_id: str,
+    request: web.Request,
+) -> web.Response:
+    try:
+        payload = await request.json()
+    except ValueError:
+        return web.Response(status=HTTPStatus.BAD_REQUEST)
+    if applied := async_apply_push(entry_data, payload):
+        entry_data["push"].async_record_push(applied)
+    return web.Response(status=HTTPStatus.OK)
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant, entry_data: dict[str, Any], webhook_id: str
+) -> Callable[[], None]:
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        "acoGO!",
+        webhook_id,
+        partial(_async_handle_webhook, entry_data),
+        allowed_methods=["POST"],
+    )
+    try:
+        url = webhook.async_generate_url(hass, webhook_id)
+    except NoURLAvailableError:
+        url = webhook.async_generate_path(webhook_id)
+    _LOGGER.info("acoGO! push notifications are accepted at %s", url)
+    # The URL has to be entered in the acoGO! cloud; show it where users look.
+    notification_id = f"{DOMAIN}_webhook_{webhook_id}"
+    persistent_notification.async_create(
+        hass,
+        f"Enter this URL as the push notification target in the acoGO! cloud:\n\n"
+        f"`{url}`",
+        title="acoGO! push notifications",
+        notification_id=notification_id,
+    )
+
+    @callback
+    def _async_unregister() -> None:
+        webhook.async_unregister(hass, webhook_id)
+        persistent_notification.async_dismiss(hass, notification_id)
+
+    return _async_unregister
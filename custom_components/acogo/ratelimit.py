@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Callable
+
+from .const import DEFAULT_GATE_MAX_INTERVAL, DEFAULT_IO_MAX_INTERVAL
+
+# Lower values are served first.
+PRIORITY_COMMAND = 0
+# Fetches that entity setup waits on.
+PRIORITY_SETUP = 1
+PRIORITY_POLL = 2
+PRIORITY_BACKGROUND = 3
+
+# The budget shared by everything using a token is sized so an account of
+# this many I/O boxes and gates, idle at the default back-off ceilings, uses
+# half of it. The other half is left for commands, busy devices and setup.
+SIZED_FOR_IO_DEVICES = 250
+SIZED_FOR_GATES = 250
+DEFAULT_RATE = 2 * (
+    SIZED_FOR_IO_DEVICES / DEFAULT_IO_MAX_INTERVAL
+    + SIZED_FOR_GATES / DEFAULT_GATE_MAX_INTERVAL
+)
+# Two seconds of budget: a poll tick batching the devices due together goes
+# out at once.
+DEFAULT_BURST = round(2 * DEFAULT_RATE)
+
+
+class AcogoRateLimiter:
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - self._clock())
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, priority: int = PRIORITY_POLL) -> None:
+        if not self._waiters and self._try_take():
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The token was granted just before cancellation; hand it back.
+                self._tokens += 1
+                self._dispatch()
+            raise
+
+    def pause(self, seconds: float) -> None:
+        # The API asked us to back off (429 Retry-After); hold every caller.
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self._tokens = 0.0
+        self._dispatch()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _try_take(self) -> bool:
+        if self.paused_for:
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _dispatch(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            waiter.set_result(None)
+
+        if not self._waiters:
+            return
+        delay = self.paused_for or max(0.0, (1 - self._tokens) / self._rate)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+
+# Extra attempts made for one request after a transient failure.
+MAX_RETRIES = 2
+# Backoff before retry n is drawn uniformly from [0, min(cap, base * 2**n)).
+RETRY_BASE_DELAY = 0.25
+RETRY_MAX_DELAY = 2.0
+
+# Each request earns a fraction of a retry, up to a fixed reserve, so retries
+# cannot multiply the load while the API is really down.
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MAX = 10.0
+
+
+class RetryBudget:
+    def __init__(
+        self, ratio: float = RETRY_BUDGET_RATIO, reserve: float = RETRY_BUDGET_MAX
+    ) -> None:
+        self._ratio = ratio
+        self._reserve = reserve
+        self._balance = reserve
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+    def deposit(self) -> None:
+        self._balance = min(self._reserve, self._balance + self._ratio)
+
+    def withdraw(self) -> bool:
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
+
+
+def backoff_delay(
+    retry: int,
+    base: float = RETRY_BASE_DELAY,
+    cap: float = RETRY_MAX_DELAY,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    # Full jitter keeps clients that failed together from retrying together.
+    return rand() * min(cap, base * 2**retry)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import AcogoApiError, AcogoClient
+from .polling import PollTier
+
+if TYPE_CHECKING:
+    from .io import AcogoIoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+IO_POLL_CONCURRENCY = 8
+# Devices that fall due within this window are folded into the same tick.
+IO_POLL_BATCH_WINDOW = 1.0
+
+
+class AcogoIoPollScheduler:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: AcogoClient,
+        concurrency: int = IO_POLL_CONCURRENCY,
+    ) -> None:
+        self.hass = hass
+        self._client = client
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._coordinators: dict[str, AcogoIoCoordinator] = {}
+        self._due: dict[str, float] = {}
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._tick_task: asyncio.Task | None = None
+        self._shutdown = False
+
+    @callback
+    def async_add(
+        self, coordinator: AcogoIoCoordinator, first_poll: float | None = None
+    ) -> None:
+        # first_poll: seconds until the first poll, one interval by default.
+        if first_poll is None:
+            first_poll = coordinator.poll_interval
+        self._coordinators[coordinator.device_id] = coordinator
+        self._due[coordinator.device_id] = self.hass.loop.time() + first_poll
+        self._schedule()
+
+    @callback
+    def async_remove(self, device_id: str) -> None:
+        self._coordinators.pop(device_id, None)
+        self._due.pop(device_id, None)
+        self._schedule()
+
+    @callback
+    def async_reschedule(self, device_id: str) -> None:
+        # A manual refresh just happened; push the next poll back a full interval.
+        coordinator = self._coordinators.get(device_id)
+        if coordinator is None:
+            return
+        self._due[device_id] = self.hass.loop.time() + coordinator.poll_interval
+        self._schedule()
+
+    def tier_counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(PollTier, 0)
+        for coordinator in self._coordinators.values():
+            counts[coordinator.tier] += 1
+        return {str(tier): count for tier, count in counts.items()}
+
+    @callback
+    def async_shutdown(self) -> None:
+        self._shutdown = True
+        self._cancel_timer()
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+        self._coordinators.clear()
+        self._due.clear()
+
+    async def async_tick(self) -> None:
+        now = self.hass.loop.time()
+        due = [
+            coordinator
+            for device_id, coordinator in self._coordinators.items()
+            if self._due[device_id] <= now + IO_POLL_BATCH_WINDOW
+            and coordinator.has_listeners
+        ]
+        if not due:
+            return
+
+        paused = self._client.circuit_open_for("io_state")
+        if paused:
+            _LOGGER.debug("acoGO! I/O polls paused for %.0fs", paused)
+            for coordinator in due:
+                self._due[coordinator.device_id] = now + paused
+            return
+
+        _LOGGER.debug("acoGO! I/O poll tick for %s devices", len(due))
+        # Results of reads that started before a write are dropped.
+        generations = {c.device_id: c.write_generation for c in due}
+        results = await self._async_fetch_states(list(generations))
+        if self._shutdown:
+            return
+
+        now = self.hass.loop.time()
+        for coordinator in due:
+            device_id = coordinator.device_id
+            if device_id not in self._coordinators:
+                # Removed while the tick was in flight.
+                continue
+            coordinator.async_handle_poll_result(
+                results[device_id], generations[device_id]
+            )
+            self._due[device_id] = now + coordinator.poll_interval
+
+    async def _async_fetch_states(
+        self, device_ids: list[str]
+    ) -> dict[str, dict[str, Any] | AcogoApiError]:
+        if self._client.supports_bulk_io_state:
+            try:
+                states = await self._client.async_get_io_states(device_ids)
+            except AcogoApiError as err:
+                _LOGGER.debug("Bulk I/O state fetch failed, falling back: %s", err)
+            else:
+                return {
+                    device_id: states.get(
+                        device_id, AcogoApiError("Missing from bulk response")
+                    )
+                    for device_id in device_ids
+                }
+
+        async def _fetch(device_id: str) -> dict[str, Any] | AcogoApiError:
+            async with self._semaphore:
+                if self._shutdown:
+                    return AcogoApiError("I/O poll scheduler shut down")
+                try:
+                    return await self._client.async_get_io_state(device_id)
+                except AcogoApiError as err:
+                    return err
+
+        states = await asyncio.gather(*(_fetch(device_id) for device_id in device_ids))
+        return dict(zip(device_ids, states))
+
+    @callback
+    def _schedule(self) -> None:
+        self._cancel_timer()
+        if self._shutdown or self._tick_task is not None or not self._due:
+            return
+        delay = max(0.0, min(self._due.values()) - self.hass.loop.time())
+        self._unsub_timer = async_call_later(self.hass, delay, self._handle_timer)
+
+    @callback
+    def _cancel_timer(self) -> None:
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _handle_timer(self, _now: Any) -> None:
+        self._unsub_timer = None
+        self._tick_task = self.hass.async_create_background_task(
+            self._async_run_tick(), "acogo_io_poll_tick"
+        )
+
+    async def _async_run_tick(self) -> None:
+        try:
+            await self.async_tick()
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("Unexpected error in acoGO! I/O poll tick")
+        finally:
+            self._tick_task = None
+            now = self.hass.loop.time()
+            for device_id, due in self._due.items():
+                coordinator = self._coordinators[device_id]
+                if due <= now and not coordinator.has_listeners:
+                    # Idle devices are re-checked once per interval.
+                    self._due[device_id] = now + coordinator.poll_interval
+            self._schedule()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import AcogoClient
+from .const import DOMAIN
+from .metrics import AcogoMetrics
+
+# Metrics live in memory; sampling them is cheap and never touches the API.
+METRICS_SAMPLE_INTERVAL = timedelta(seconds=60)
+
+
+def _latency_ms(metrics: AcogoMetrics, quantile: float) -> float | None:
+    value = metrics.latency().percentile(quantile)
+    return None if value is None else value * 1000
+
+
+@dataclass(frozen=True, kw_only=True)
+class AcogoMetricSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[AcogoMetrics], float | int | None]
+
+
+METRIC_SENSORS: tuple[AcogoMetricSensorDescription, ...] = (
+    AcogoMetricSensorDescription(
+        key="api_requests",
+        name="API requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.total_requests,
+    ),
+    AcogoMetricSensorDescription(
+        key="api_latency_p95",
+        name="API latency (p95)",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: _latency_ms(metrics, 0.95),
+    ),
+    AcogoMetricSensorDescription(
+        key="api_errors",
+        name="API errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.errors,
+    ),
+    AcogoMetricSensorDescription(
+        key="api_offline_responses",
+        name="API device offline responses",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.count(408),
+    ),
+    AcogoMetricSensorDescription(
+        key="api_in_flight",
+        name="API requests in flight",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: metrics.in_flight,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    client: AcogoClient = hass.data[DOMAIN][entry.entry_id]["client"]
+    async_add_entities(
+        AcogoMetricSensor(entry, client.metrics, description)
+        for description in METRIC_SENSORS
+    )
+
+
+class AcogoMetricSensor(SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_should_poll = False
+    entity_description: AcogoMetricSensorDescription
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        metrics: AcogoMetrics,
+        description: AcogoMetricSensorDescription,
+    ) -> None:
+        self.entity_description = description
+        self._metrics = metrics
+        self._attr_name = f"acoGO! {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title or "acoGO!",
+            manufacturer="ACO",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        # Only enabled sensors sample, so the default setup carries no timers.
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_sample, METRICS_SAMPLE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_sample(self, _now) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> float | int | None:
+        return self.entity_description.value_fn(self._metrics)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+
+SERVICE_SET_OUTPUTS = "set_outputs"
+
+IO_MODEL = "acoGO! I/O"
+
+ATTR_DEVICES = "devices"
+ATTR_OUTPUTS = "outputs"
+
+# Devices written to at once by one service call.
+SERVICE_WRITE_CONCURRENCY = 4
+
+OUTPUTS_SCHEMA = vol.Schema({vol.All(vol.Coerce(int), vol.Range(1, 4)): cv.boolean})
+
+SET_OUTPUTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+            vol.Optional(ATTR_OUTPUTS): OUTPUTS_SCHEMA,
+            vol.Optional(ATTR_DEVICES): [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_DEVICE_ID): cv.string,
+                        vol.Required(ATTR_OUTPUTS): OUTPUTS_SCHEMA,
+                    }
+                )
+            ],
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_DEVICES),
+    cv.key_dependency(ATTR_DEVICE_ID, ATTR_OUTPUTS),
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    if hass.services.has_service(DOMAIN, SERVICE_SET_OUTPUTS):
+        return
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_OUTPUTS,
+        partial(_async_set_outputs, hass),
+        schema=SET_OUTPUTS_SCHEMA,
+    )
+
+
+def _find_device(
+    hass: HomeAssistant, dev_id: str
+) -> tuple[dict[str, Any], dict[str, Any]] | None:
+    # The entry data and device list entry of an acoGO! device.
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        # hass.data[DOMAIN] may hold domain-wide state next to the entries.
+        if not isinstance(entry_data, dict) or "coordinator" not in entry_data:
+            continue
+        for device in entry_data["coordinator"].devices:
+            if device.get("devId") == dev_id:
+                return entry_data, device
+    return None
+
+
+def _resolve_dev_id(hass: HomeAssistant, device_id: str) -> str:
+    # Accept Home Assistant device ids as well as raw acoGO! device ids.
+    device_entry = dr.async_get(hass).async_get(device_id)
+    if device_entry is None:
+        return device_id
+    for domain, identifier in device_entry.identifiers:
+        if domain == DOMAIN:
+            return identifier
+    raise HomeAssistantError(f"{device_id} is not an acoGO! device")
+
+
+async def _async_set_outputs(hass: HomeAssistant, call: ServiceCall) -> None:
+    requested: dict[str, dict[int, bool]] = {}
+    for device_id in call.data.get(ATTR_DEVICE_ID, []):
+        requested.setdefault(_resolve_dev_id(hass, device_id), {}).update(
+            call.data[ATTR_OUTPUTS]
+        )
+    for device in call.data.get(ATTR_DEVICES, []):
+        requested.setdefault(_resolve_dev_id(hass, device[ATTR_DEVICE_ID]), {}).update(
+            device[ATTR_OUTPUTS]
+        )
+
+    targets = []
+    for dev_id, outputs in requested.items():
+        found = _find_device(hass, dev_id)
+        if found is None:
+            raise HomeAssistantError(f"Unknown acoGO! device {dev_id}")
+        entry_data, device = found
+        if device.get("model") != IO_MODEL:
+            raise HomeAssistantError(f"{dev_id} is not an acoGO! I/O device")
+        targets.append((entry_data, dev_id, outputs))
+
+    semaphore = asyncio.Semaphore(SERVICE_WRITE_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_async_write_outputs(semaphore, *target) for target in targets),
+        return_exceptions=True,
+    )
+    failed = [
+        f"{dev_id}: {result}"
+        for (_, dev_id, _), result in zip(targets, results)
+        if isinstance(result, Exception)
+    ]
+    if failed:
+        raise HomeAssistantError(f"Could not set acoGO! outputs: {', '.join(failed)}")
+
+
+async def _async_write_outputs(
+    semaphore: asyncio.Semaphore,
+    entry_data: dict[str, Any],
+    dev_id: str,
+    outputs: dict[int, bool],
+) -> None:
+    client = entry_data["client"]
+    commands = entry_data["command_queue"]
+    coordinator = entry_data.get("io_coordinators", {}).get(dev_id)
+    if coordinator is not None and coordinator.is_offline:
+        raise HomeAssistantError("acoGO! I/O device is offline.")
+
+    writes = []
+    for out_number, state in outputs.items():
+        on_sent = on_drained = None
+        if coordinator is not None:
+            on_sent = partial(coordinator.async_apply_output, out_number, state)
+            on_drained = coordinator.async_confirm_state
+        writes.append(
+            commands.async_submit(
+                dev_id,
+                ("set_output", out_number, state),
+                partial(client.async_set_io_output, dev_id, out_number, state),
+                target=("set_output", out_number),
+                on_sent=on_sent,
+                on_drained=on_drained,
+            )
+        )
+
+    # Devices are written in parallel. Queuing all writes of a box together
+    # keeps them serial there and reads its state back once, after the last.
+    async with semaphore:
+        await asyncio.gather(*writes)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.util.ssl import get_default_context
+
+from .metrics import ConnectionStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Every request goes to the single API host, so the pool is tuned for it.
+POOL_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 60.0
+DNS_CACHE_TTL = 300
+PREWARM_CONNECTIONS = 2
+PREWARM_TIMEOUT = 10.0
+
+
+def create_dedicated_session(stats: ConnectionStats) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=POOL_LIMIT_PER_HOST,
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        ssl=get_default_context(),
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        trace_configs=[stats.trace_config()],
+        headers={"User-Agent": f"HomeAssistant/{HA_VERSION} acogo"},
+    )
+
+
+async def async_prewarm(
+    session: aiohttp.ClientSession, origin: str, connections: int = PREWARM_CONNECTIONS
+) -> None:
+    # Resolve DNS and finish TCP/TLS handshakes before the first real request;
+    # the responses themselves are irrelevant.
+    async def _open() -> None:
+        async with session.head(
+            origin, timeout=aiohttp.ClientTimeout(total=PREWARM_TIMEOUT)
+        ):
+            pass
+
+    results = await asyncio.gather(
+        *(_open() for _ in range(connections)), return_exceptions=True
+    )
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        _LOGGER.debug("Pre-warming acoGO! API connections failed: %r", failures[0])
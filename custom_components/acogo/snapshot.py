@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+# Inputs take the low bits of a snapshot's port mask, outputs start here.
+OUTPUT_SHIFT = 16
+MAX_PORTS = OUTPUT_SHIFT
+INPUT_MASK = (1 << OUTPUT_SHIFT) - 1
+
+
+def input_bit(number: int) -> int:
+    return 1 << (number - 1)
+
+
+def output_bit(number: int) -> int:
+    return 1 << (number - 1 + OUTPUT_SHIFT)
+
+
+def iter_outputs(mask: int) -> Iterator[int]:
+    # Output numbers whose bit is set in mask.
+    mask >>= OUTPUT_SHIFT
+    number = 1
+    while mask:
+        if mask & 1:
+            yield number
+        mask >>= 1
+        number += 1
+
+
+def _parse_ports(ports: Any, prefix: str, shift: int) -> tuple[int, int]:
+    values = known = 0
+    if not isinstance(ports, Mapping):
+        return values, known
+    offset = len(prefix)
+    for key, value in ports.items():
+        number = key[offset:] if isinstance(key, str) and key.startswith(prefix) else ""
+        if not number.isdigit() or not 1 <= int(number) <= MAX_PORTS:
+            continue
+        bit = 1 << (int(number) - 1 + shift)
+        known |= bit
+        if value:
+            values |= bit
+    return values, known
+
+
+class IoSnapshot:
+    # One parsed I/O state; ports and known are bitmasks (see input_bit and
+    # output_bit), so reads are a bit test and comparisons a single XOR.
+    __slots__ = ("ports", "known", "offline", "fetched_at")
+
+    def __init__(
+        self,
+        ports: int = 0,
+        known: int = 0,
+        offline: bool = False,
+        fetched_at: float | None = None,
+    ) -> None:
+        self.ports = ports
+        self.known = known
+        self.offline = offline
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @classmethod
+    def from_payload(cls, state: Any) -> IoSnapshot:
+        payload: Any = {}
+        if isinstance(state, Mapping):
+            payload = state.get("message") or state
+        if not isinstance(payload, Mapping):
+            payload = {}
+        inputs, known_inputs = _parse_ports(payload.get("inputs"), "in", 0)
+        outputs, known_outputs = _parse_ports(
+            payload.get("outputs"), "out", OUTPUT_SHIFT
+        )
+        return cls(inputs | outputs, known_inputs | known_outputs)
+
+    @classmethod
+    def offline_snapshot(cls) -> IoSnapshot:
+        return cls(offline=True)
+
+    @property
+    def inputs(self) -> int:
+        return self.ports & INPUT_MASK
+
+    @property
+    def outputs(self) -> int:
+        return self.ports >> OUTPUT_SHIFT
+
+    def get(self, bit: int) -> bool | None:
+        if not self.known & bit:
+            return None
+        return bool(self.ports & bit)
+
+    def with_port(self, bit: int, state: bool) -> IoSnapshot:
+        ports = self.ports | bit if state else self.ports & ~bit
+        return IoSnapshot(ports, self.known | bit, self.offline, self.fetched_at)
+
+    def merged(self, update: IoSnapshot) -> IoSnapshot:
+        # Ports known to update replace ours; the rest are kept.
+        return IoSnapshot(
+            (self.ports & ~update.known) | update.ports,
+            self.known | update.known,
+            update.offline,
+            update.fetched_at,
+        )
+
+    def diff(self, other: IoSnapshot) -> int | None:
+        # Bits of ports that differ, or None when the snapshots are not
+        # comparable port by port (one of them is offline and the other not).
+        if self.offline != other.offline:
+            return None
+        return (self.ports ^ other.ports) | (self.known ^ other.known)
+
+    def __eq__(self, other: object) -> bool:
+        # fetched_at is deliberately ignored: an unchanged state is equal.
+        if not isinstance(other, IoSnapshot):
+            return NotImplemented
+        return (
+            self.ports == other.ports
+            and self.known == other.known
+            and self.offline == other.offline
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "inputs": {
+                f"in{number}": bool(self.ports & input_bit(number))
+                for number in range(1, MAX_PORTS + 1)
+                if self.known & input_bit(number)
+            },
+            "outputs": {
+                f"out{number}": bool(self.ports & output_bit(number))
+                for number in iter_outputs(self.known)
+            },
+            "offline": self.offline,
+            "fetched_at": self.fetched_at,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"IoSnapshot(ports={self.ports:#x}, known={self.known:#x},"
+            f" offline={self.offline})"
+        )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .snapshot import IoSnapshot
+
+STORAGE_VERSION = 1
+# States change far more often than details; batch them into fewer writes.
+SAVE_DELAY = 30
+# Devices seeded from storage spread their first poll over this many seconds
+# instead of all reading their state at startup.
+SEEDED_REFRESH_SPREAD = 30
+# States older than this say little about the device now; they are dropped
+# on load and the device starts from unknown.
+STATE_MAX_AGE = timedelta(days=7)
+
+
+def _storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.state"
+
+
+def _drop_older(
+    entries: dict[str, dict[str, Any]], cutoff: float
+) -> dict[str, dict[str, Any]]:
+    return {
+        device_id: entry
+        for device_id, entry in entries.items()
+        if (entry.get("fetched_at") or 0) >= cutoff
+    }
+
+
+class AcogoStateStore:
+    # Last good state per device, so a restart starts from it instead of
+    # from unknown. Only states read from the device are kept, never
+    # optimistic guesses or offline markers.
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self._io: dict[str, dict[str, Any]] = {}
+        self._gates: dict[str, dict[str, Any]] = {}
+        self._closed = False
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        if isinstance(data, dict):
+            cutoff = time.time() - STATE_MAX_AGE.total_seconds()
+            self._io = _drop_older(data.get("io") or {}, cutoff)
+            self._gates = _drop_older(data.get("gates") or {}, cutoff)
+
+    def get_io(self, device_id: str) -> IoSnapshot | None:
+        entry = self._io.get(device_id)
+        if entry is None:
+            return None
+        return IoSnapshot(entry["ports"], entry["known"], False, entry["fetched_at"])
+
+    def get_gate(self, device_id: str) -> dict[str, Any] | None:
+        entry = self._gates.get(device_id)
+        return entry["details"] if entry else None
+
+    @callback
+    def async_set_io(self, device_id: str, snapshot: IoSnapshot) -> None:
+        if snapshot.offline:
+            return
+        previous = self._io.get(device_id)
+        self._io[device_id] = {
+            "ports": snapshot.ports,
+            "known": snapshot.known,
+            "fetched_at": snapshot.fetched_at,
+        }
+        # A newer fetched_at alone is not worth a write; it is kept in memory
+        # and goes out with the next one.
+        if (
+            previous is None
+            or previous["ports"] != snapshot.ports
+            or previous["known"] != snapshot.known
+        ):
+            self._async_schedule_save()
+
+    @callback
+    def async_set_gate(
+        self, device_id: str, details: dict[str, Any], fetched_at: float
+    ) -> None:
+        previous = self._gates.get(device_id)
+        self._gates[device_id] = {"details": details, "fetched_at": fetched_at}
+        if previous is None or previous["details"] != details:
+            self._async_schedule_save()
+
+    @callback
+    def async_discard(self, device_id: str) -> None:
+        removed = self._io.pop(device_id, None), self._gates.pop(device_id, None)
+        if any(entry is not None for entry in removed):
+            self._async_schedule_save()
+
+    async def async_close(self) -> None:
+        # Write out pending changes now; a delayed write landing after the
+        # entry was removed would recreate its file.
+        self._closed = True
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        if not self._closed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"io": self._io, "gates": self._gates}
+
+
+async def async_remove_state_store(hass: HomeAssistant, entry_id: str) -> None:
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
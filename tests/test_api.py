@@ -1,6 +1,21 @@
-import pytest
+import asyncio
 
-from custom_components.acogo.api import API_BASE, AcogoApiError, AcogoClient
+import aiohttp
+import pytest
+from aiohttp.client_reqrep import ConnectionKey
+
+from custom_components.acogo import api
+from custom_components.acogo.api import (
+    API_BASE,
+    AcogoApiError,
+    AcogoCircuitOpenError,
+    AcogoClient,
+    AcogoRateLimitError,
+    endpoint_family,
+    parse_retry_after,
+)
+from custom_components.acogo.circuit import CircuitState
+from custom_components.acogo.retry import backoff_delay
 
 
 class MockResponse:
@@ -10,8 +25,10 @@ class MockResponse:
         json_data=None,
         text_data=None,
         content_type="application/json",
+        headers=None,
     ):
         self.status = status
+        self.headers = headers or {}
         self._json_data = json_data
         self._text_data = text_data or ""
         self.content_type = content_type
@@ -122,3 +139,358 @@ async def test_async_get_devices_calls_request(monkeypatch):
 
     assert called == {"method": "GET", "path": "/devices"}
     assert result == {"devices": []}
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_server_errors():
+    response = MockResponse(503, text_data="down", content_type="text/plain")
+    session = MockSession(response)
+    client = AcogoClient(session, "token")
+
+    for _ in range(5):
+        with pytest.raises(AcogoApiError):
+            await client.async_get_io_state("io-1")
+
+    with pytest.raises(AcogoCircuitOpenError) as err:
+        await client.async_get_io_state("io-2")
+
+    assert len(session.calls) == 5
+    assert err.value.family == "io_state"
+    assert client.circuit_open_for("io_state") > 0
+    # Other endpoint families are unaffected.
+    with pytest.raises(AcogoApiError) as other:
+        await client.async_get_devices()
+    assert not isinstance(other.value, AcogoCircuitOpenError)
+
+
+@pytest.mark.asyncio
+async def test_circuit_ignores_offline_devices():
+    response = MockResponse(408, text_data="offline", content_type="text/plain")
+    session = MockSession(response)
+    client = AcogoClient(session, "token")
+
+    for _ in range(10):
+        with pytest.raises(AcogoApiError) as err:
+            await client.async_get_io_state("io-1")
+        assert err.value.status == 408
+
+    assert client.circuit_open_for("io_state") == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_half_open_trial_closes_on_success():
+    responses = [MockResponse(500, text_data="x", content_type="text/plain")] * 5
+    responses.append(MockResponse(200, json_data={"ok": True}))
+
+    def factory(method, url, headers=None, **kwargs):
+        return responses.pop(0)
+
+    client = AcogoClient(MockSession(factory), "token")
+    for _ in range(5):
+        with pytest.raises(AcogoApiError):
+            await client.async_get_devices()
+
+    breaker = client._breaker("devices")
+    assert breaker.state is CircuitState.OPEN
+    breaker._opened_at -= 60
+
+    assert await client.async_get_devices() == {"ok": True}
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_endpoint_family_groups_paths():
+    assert endpoint_family("/devices") == "devices"
+    assert endpoint_family("/devices/io/abc") == "io_details"
+    assert endpoint_family("/devices/gates/abc") == "gate_details"
+    assert endpoint_family("/devices/abc/orders/ez-open") == "gate_orders"
+    assert endpoint_family("/io/abc/state") == "io_state"
+    assert endpoint_family("/io/abc/out/2") == "io_outputs"
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_share_one_request():
+    release = asyncio.Event()
+
+    class SlowResponse(MockResponse):
+        async def __aenter__(self):
+            await release.wait()
+            return self
+
+    session = MockSession(
+        lambda method, url, headers=None, **kwargs: SlowResponse(
+            200, json_data={"inputs": {}}
+        )
+    )
+    client = AcogoClient(session, "token")
+
+    tasks = [
+        asyncio.create_task(client.async_get_io_state("io-1")) for _ in range(3)
+    ]
+    other = asyncio.create_task(client.async_get_io_state("io-2"))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, other)
+
+    assert [call[1] for call in session.calls] == [
+        f"{API_BASE}/io/io-1/state",
+        f"{API_BASE}/io/io-2/state",
+    ]
+    assert results[0] is results[1] is results[2]
+    assert client._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_fresh_get_does_not_join_in_flight_request():
+    release = asyncio.Event()
+
+    class SlowResponse(MockResponse):
+        async def __aenter__(self):
+            await release.wait()
+            return self
+
+    session = MockSession(
+        lambda method, url, headers=None, **kwargs: SlowResponse(
+            200, json_data={"inputs": {}}
+        )
+    )
+    client = AcogoClient(session, "token")
+
+    shared = asyncio.create_task(client.async_get_io_state("io-1"))
+    await asyncio.sleep(0)
+    fresh = asyncio.create_task(client.async_get_io_state("io-1", fresh=True))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(shared, fresh)
+
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_in_flight_get_is_cancelled_with_its_last_caller():
+    started = asyncio.Event()
+
+    class HangingResponse(MockResponse):
+        async def __aenter__(self):
+            started.set()
+            await asyncio.Event().wait()
+
+    session = MockSession(
+        lambda method, url, headers=None, **kwargs: HangingResponse(200)
+    )
+    client = AcogoClient(session, "token")
+
+    callers = [
+        asyncio.create_task(client.async_get_io_state("io-1")) for _ in range(2)
+    ]
+    await started.wait()
+    (future,) = client._inflight.values()
+    callers[0].cancel()
+    await asyncio.sleep(0)
+    assert not future.done()
+
+    callers[1].cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert future.cancelled()
+    assert client._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_coalesced_gets_share_the_same_exception():
+    release = asyncio.Event()
+
+    class SlowResponse(MockResponse):
+        async def __aenter__(self):
+            await release.wait()
+            return self
+
+    session = MockSession(
+        lambda method, url, headers=None, **kwargs: SlowResponse(
+            408, text_data="offline", content_type="text/plain"
+        )
+    )
+    client = AcogoClient(session, "token")
+
+    tasks = [asyncio.create_task(client.async_get_gate_details("g")) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert len(session.calls) == 1
+    assert all(isinstance(result, AcogoApiError) for result in results)
+    assert results[0].status == 408
+
+
+@pytest.mark.asyncio
+async def test_posts_are_never_coalesced():
+    session = MockSession(MockResponse(200, json_data={}))
+    client = AcogoClient(session, "token")
+
+    await asyncio.gather(client.async_open_gate("g"), client.async_open_gate("g"))
+
+    assert len(session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_response_pauses_client():
+    response = MockResponse(
+        429,
+        text_data="slow down",
+        content_type="text/plain",
+        headers={"Retry-After": "7"},
+    )
+    client = AcogoClient(MockSession(response), "token")
+
+    with pytest.raises(AcogoRateLimitError) as err:
+        await client.async_get_io_state("io-1")
+
+    assert err.value.status == 429
+    assert err.value.retry_after == 7
+    assert 6 < client._limiter.paused_for <= 7
+    assert client.circuit_open_for("io_state") == 0
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after(None) == 10
+    assert parse_retry_after("garbage") == 10
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+class SlowResponse(MockResponse):
+    def __init__(self, delay, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._delay = delay
+
+    async def __aenter__(self):
+        await asyncio.sleep(self._delay)
+        return self
+
+
+@pytest.mark.asyncio
+async def test_state_reads_use_their_own_timeout(monkeypatch):
+    monkeypatch.setitem(api.REQUEST_TIMEOUTS, "io_state", 0.01)
+    session = MockSession(SlowResponse(1, 200, json_data={}))
+    client = AcogoClient(session, "token", hedge_reads=False)
+
+    with pytest.raises(AcogoApiError):
+        await client.async_get_io_state("abc")
+
+    assert client.metrics.endpoint("io_state").statuses["timeout"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_state_read_is_hedged():
+    responses = [
+        SlowResponse(5, 200, json_data={"attempt": 1}),
+        SlowResponse(0, 200, json_data={"attempt": 2}),
+    ]
+    session = MockSession(lambda *args, **kwargs: responses.pop(0))
+    client = AcogoClient(session, "token")
+    for _ in range(api.HEDGE_MIN_SAMPLES):
+        client.metrics.endpoint("io_state").latency.observe(0.01)
+
+    result = await client.async_get_io_state("abc")
+
+    assert result == {"attempt": 2}
+    assert len(session.calls) == 2
+    statuses = client.metrics.endpoint("io_state").statuses
+    assert statuses["hedged"] == 1
+    assert statuses["cancelled"] == 1
+    assert client.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_are_never_hedged():
+    session = MockSession(SlowResponse(0.3, 200, json_data={}))
+    client = AcogoClient(session, "token")
+    for _ in range(api.HEDGE_MIN_SAMPLES):
+        client.metrics.endpoint("gate_orders").latency.observe(0.01)
+
+    await client.async_open_gate("gate-1")
+
+    assert len(session.calls) == 1
+
+
+def failing_then(error, response):
+    attempts = [error]
+
+    def factory(method, url, headers=None, **kwargs):
+        if attempts:
+            raise attempts.pop()
+        return response
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_reads_are_retried_after_a_connection_reset(monkeypatch):
+    monkeypatch.setattr(api, "backoff_delay", lambda retry: 0)
+    reset = aiohttp.ClientOSError(104, "Connection reset by peer")
+    session = MockSession(failing_then(reset, MockResponse(200, json_data={"a": 1})))
+    client = AcogoClient(session, "token")
+
+    assert await client.async_get_io_state("io-1") == {"a": 1}
+
+    assert len(session.calls) == 2
+    statuses = client.metrics.endpoint("io_state").statuses
+    assert statuses["retry"] == 1
+    assert statuses["error"] == 1
+    assert client._breaker("io_state")._failures == 0
+
+
+@pytest.mark.asyncio
+async def test_orders_are_not_replayed_once_sent(monkeypatch):
+    monkeypatch.setattr(api, "backoff_delay", lambda retry: 0)
+    session = MockSession(
+        failing_then(aiohttp.ServerDisconnectedError(), MockResponse(200, json_data={}))
+    )
+    client = AcogoClient(session, "token")
+
+    with pytest.raises(AcogoApiError):
+        await client.async_open_gate("gate-1")
+
+    assert len(session.calls) == 1
+    assert client.metrics.endpoint("gate_orders").statuses["retry"] == 0
+
+
+@pytest.mark.asyncio
+async def test_orders_are_retried_when_the_connection_never_opened(monkeypatch):
+    monkeypatch.setattr(api, "backoff_delay", lambda retry: 0)
+    key = ConnectionKey("api.aco.com.pl", 443, True, True, None, None, None)
+    refused = aiohttp.ClientConnectorError(key, ConnectionRefusedError(111, "x"))
+    session = MockSession(failing_then(refused, MockResponse(200, json_data={})))
+    client = AcogoClient(session, "token")
+
+    await client.async_open_gate("gate-1")
+
+    assert len(session.calls) == 2
+    assert client.metrics.endpoint("gate_orders").statuses["retry"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_when_the_budget_is_spent(monkeypatch):
+    monkeypatch.setattr(api, "backoff_delay", lambda retry: 0)
+
+    def reset(method, url, headers=None, **kwargs):
+        raise aiohttp.ServerDisconnectedError()
+
+    session = MockSession(reset)
+    client = AcogoClient(session, "token")
+    client.retry_budget._balance = 2.8
+
+    with pytest.raises(AcogoApiError):
+        await client.async_get_devices()
+    assert len(session.calls) == 3
+
+    with pytest.raises(AcogoApiError):
+        await client.async_get_devices()
+    assert len(session.calls) == 5
+    assert client.metrics.endpoint("devices").statuses["retry"] == 3
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    assert backoff_delay(0, rand=lambda: 0.5) == 0.125
+    assert backoff_delay(2, rand=lambda: 1.0) == 1.0
+    assert backoff_delay(10, rand=lambda: 1.0) == 2.0
+    assert backoff_delay(3, rand=lambda: 0.0) == 0.0
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from custom_components.acogo.commands import (
+    COMMAND_DEDUPE_WINDOW,
+    AcogoCommandQueue,
+)
+
+
+class SlowSender:
+    def __init__(self):
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, name):
+        async def _send():
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.sent.append(name)
+            self.in_flight -= 1
+
+        return _send
+
+
+@pytest.mark.asyncio
+async def test_repeated_commands_collapse_into_one():
+    now = [0.0]
+    queue = AcogoCommandQueue(clock=lambda: now[0])
+    sender = SlowSender()
+
+    await asyncio.gather(
+        *(queue.async_submit("gate-1", ("open",), sender("open")) for _ in range(5))
+    )
+    await queue.async_submit("gate-1", ("open",), sender("open"))
+    assert sender.sent == ["open"]
+
+    now[0] += COMMAND_DEDUPE_WINDOW + 1
+    await queue.async_submit("gate-1", ("open",), sender("open"))
+    assert sender.sent == ["open", "open"]
+
+
+@pytest.mark.asyncio
+async def test_later_command_for_the_same_target_is_not_dropped():
+    now = [0.0]
+    queue = AcogoCommandQueue(clock=lambda: now[0])
+    sender = SlowSender()
+
+    for state in (True, False, True):
+        await queue.async_submit(
+            "io-1",
+            ("set_output", 1, state),
+            sender(state),
+            target=("set_output", 1),
+        )
+
+    assert sender.sent == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_pending_command_is_not_joined_once_superseded():
+    queue = AcogoCommandQueue()
+    sender = SlowSender()
+
+    await asyncio.gather(
+        *(
+            queue.async_submit(
+                "io-1",
+                ("set_output", 1, state),
+                sender(state),
+                target=("set_output", 1),
+            )
+            for state in (True, False, True)
+        )
+    )
+
+    assert sender.sent == [True, False, True]
+
+
+@pytest.mark.asyncio
+async def test_writes_to_one_device_are_serialized_with_one_drain():
+    queue = AcogoCommandQueue()
+    sender = SlowSender()
+    sent = []
+    drained = []
+
+    def on_drained():
+        drained.append(list(sender.sent))
+
+    await asyncio.gather(
+        *(
+            queue.async_submit(
+                "io-1",
+                ("out", n),
+                sender(f"out{n}"),
+                on_sent=lambda n=n: sent.append(n),
+                on_drained=on_drained,
+            )
+            for n in range(1, 4)
+        )
+    )
+
+    assert sender.sent == ["out1", "out2", "out3"]
+    assert sender.max_in_flight == 1
+    assert sent == [1, 2, 3]
+    assert drained == [["out1", "out2", "out3"]]
+    assert not queue._devices["io-1"].pending
+
+
+@pytest.mark.asyncio
+async def test_failed_command_is_not_deduplicated():
+    queue = AcogoCommandQueue()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        queue.async_submit("gate-1", ("open",), failing),
+        queue.async_submit("gate-1", ("open",), failing),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(RuntimeError):
+        await queue.async_submit("gate-1", ("open",), failing)
+    assert len(calls) == 2
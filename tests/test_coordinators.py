@@ -1,11 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+
 import pytest
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from custom_components.acogo.api import AcogoApiError
-from custom_components.acogo.const import DOMAIN
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.acogo.api import AcogoApiError, AcogoCircuitOpenError
+from custom_components.acogo.const import (
+    CONF_GATE_MAX_INTERVAL,
+    CONF_GATE_MIN_INTERVAL,
+    DEFAULT_GATE_MAX_INTERVAL,
+    DOMAIN,
+)
+from custom_components.acogo.details import AcogoDetailsCache
 from custom_components.acogo.gate import (
+    GATE_UPDATE_INTERVAL,
     AcogoGateCoordinator,
     async_get_or_create_gate_coordinator,
 )
@@ -13,6 +24,8 @@ from custom_components.acogo.io import (
     AcogoIoCoordinator,
     async_get_or_create_io_coordinator,
 )
+from custom_components.acogo.polling import gate_interval_from_options
+from custom_components.acogo.snapshot import input_bit, output_bit
 
 
 class DummyClient:
@@ -38,13 +51,13 @@ class DummyClient:
             raise self.gate_error
         return self.gate_payload
 
-    async def async_get_io_state(self, device_id: str):
+    async def async_get_io_state(self, device_id: str, fresh: bool = False):
         self.calls.append(("io_state", device_id))
         if self.io_error:
             raise self.io_error
         return self.io_state
 
-    async def async_get_io_details(self, device_id: str):
+    async def async_get_io_details(self, device_id: str, priority=None):
         self.calls.append(("io_details", device_id))
         if self.io_error:
             raise self.io_error
@@ -100,25 +113,35 @@ async def test_async_get_or_create_gate_coordinator_reuses_instance(
 
 
 @pytest.mark.asyncio
-async def test_async_get_or_create_gate_coordinator_sets_offline_on_failure(
-    hass, monkeypatch
-):
-    hass.data.setdefault(DOMAIN, {})["entry"] = {}
-    client = DummyClient()
-
-    async def failing_refresh(self):
-        raise UpdateFailed("boom")
+async def test_async_get_or_create_gate_coordinator_refreshes_in_background(hass):
+    cache = AcogoDetailsCache(hass, "entry")
+    cache.async_set("gate-1", {"status": "cached"})
+    hass.data.setdefault(DOMAIN, {})["entry"] = {"details_cache": cache}
+    client = DummyClient(gate_error=AcogoApiError("offline", status=408))
 
-    monkeypatch.setattr(
-        AcogoGateCoordinator, "async_config_entry_first_refresh", failing_refresh
+    coordinator = await async_get_or_create_gate_coordinator(
+        hass, "entry", client, "gate-1"
     )
 
+    # Handed out on the cached details; the cloud was never reached.
+    await hass.async_block_till_done()
+    assert coordinator.restored
+    assert coordinator.is_offline
+    assert coordinator.data == {"status": "cached"}
+
+
+@pytest.mark.asyncio
+async def test_first_gate_read_without_cached_details_is_not_a_change(hass):
+    hass.data.setdefault(DOMAIN, {})["entry"] = {}
+    client = DummyClient(gate_payload={"status": "ok"})
+
     coordinator = await async_get_or_create_gate_coordinator(
         hass, "entry", client, "gate-1"
     )
+    await hass.async_block_till_done()
 
-    assert coordinator.is_offline
-    assert coordinator.data == {}
+    assert coordinator.data == {"status": "ok"}
+    assert not coordinator._interval.boosted
 
 
 @pytest.mark.asyncio
@@ -129,8 +152,8 @@ async def test_io_coordinator_formats_state(hass):
 
     result = await coordinator._async_update_data()
 
-    assert result["inputs"]["in1"] is True
-    assert result["outputs"]["out1"] is False
+    assert result.get(input_bit(1)) is True
+    assert result.get(output_bit(1)) is False
     assert not coordinator.is_offline
 
 
@@ -141,7 +164,7 @@ async def test_io_coordinator_handles_offline(hass):
 
     result = await coordinator._async_update_data()
 
-    assert result["_offline"]
+    assert result.offline
     assert coordinator.is_offline
 
 
@@ -154,8 +177,8 @@ async def test_io_coordinator_refresh_state_updates_data(hass):
 
     await coordinator.async_refresh_state()
 
-    assert coordinator.data["inputs"]["in2"] is True
-    assert coordinator.data["outputs"]["out3"] is True
+    assert coordinator.data.get(input_bit(2)) is True
+    assert coordinator.data.get(output_bit(3)) is True
     assert not coordinator.is_offline
 
 
@@ -173,29 +196,44 @@ async def test_io_coordinator_async_get_details_caches(hass):
 
 
 @pytest.mark.asyncio
-async def test_async_get_or_create_io_coordinator_sets_offline_on_refresh_error(
-    hass, monkeypatch
-):
+async def test_async_get_or_create_io_coordinator_refreshes_in_background(hass):
     hass.data.setdefault(DOMAIN, {})["entry"] = {}
-    client = DummyClient()
+    client = DummyClient(io_error=AcogoApiError("offline", status=408))
+
+    coordinator = await async_get_or_create_io_coordinator(
+        hass, "entry", client, "io-1"
+    )
 
-    async def fake_get_details(self):
-        return {}
+    await hass.async_block_till_done()
+    assert coordinator.restored
+    assert coordinator.is_offline
+    assert coordinator.data.offline
 
-    async def failing_refresh(self):
-        raise UpdateFailed("fail")
 
-    monkeypatch.setattr(AcogoIoCoordinator, "async_get_details", fake_get_details)
-    monkeypatch.setattr(
-        AcogoIoCoordinator, "async_config_entry_first_refresh", failing_refresh
-    )
+@pytest.mark.asyncio
+async def test_io_coordinator_creation_does_not_wait_for_the_cloud(hass):
+    cache = AcogoDetailsCache(hass, "entry")
+    cache.async_set("io-1", {"in1Name": "Door"})
+    hass.data.setdefault(DOMAIN, {})["entry"] = {"details_cache": cache}
+    release = asyncio.Event()
+
+    class HangingClient(DummyClient):
+        async def async_get_io_state(self, device_id: str, fresh: bool = False):
+            await release.wait()
+            return {"inputs": {"in1": True}}
 
     coordinator = await async_get_or_create_io_coordinator(
-        hass, "entry", client, "io-1"
+        hass, "entry", HangingClient(), "io-1"
     )
 
-    assert coordinator.is_offline
-    assert coordinator.data["_offline"]
+    assert coordinator.details == {"in1Name": "Door"}
+    assert coordinator.data is None
+    assert coordinator.restored
+
+    release.set()
+    await hass.async_block_till_done()
+    assert coordinator.data.get(input_bit(1)) is True
+    assert not coordinator.restored
 
 
 @pytest.mark.asyncio
@@ -204,3 +242,272 @@ async def test_async_get_or_create_io_coordinator_propagates_missing_entry(hass)
         await async_get_or_create_io_coordinator(
             hass, "missing", DummyClient(), "io-1"
         )
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_backs_off_while_state_is_unchanged(hass):
+    client = DummyClient(io_state={"inputs": {"in1": False}, "outputs": {}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert coordinator.update_interval.total_seconds() > 5
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_speeds_up_after_activity(hass):
+    client = DummyClient(io_state={"inputs": {}, "outputs": {}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+
+    coordinator.async_note_activity()
+
+    assert coordinator.update_interval.total_seconds() == 2
+
+
+@pytest.mark.asyncio
+async def test_gate_coordinator_backs_off_hard_while_offline(hass):
+    client = DummyClient(gate_error=AcogoApiError("offline", status=408))
+    coordinator = AcogoGateCoordinator(hass, client, "gate-1")
+    remove = coordinator.async_add_listener(lambda: None)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.update_interval.total_seconds() == DEFAULT_GATE_MAX_INTERVAL
+    remove()
+
+
+@pytest.mark.asyncio
+async def test_gate_health_check_follows_interval_options(hass):
+    client = DummyClient(gate_payload={"status": "ok"})
+    interval = gate_interval_from_options(
+        {CONF_GATE_MIN_INTERVAL: 5, CONF_GATE_MAX_INTERVAL: 600},
+        GATE_UPDATE_INTERVAL.total_seconds(),
+    )
+    coordinator = AcogoGateCoordinator(hass, client, "gate-1", interval)
+    remove = coordinator.async_add_listener(lambda: None)
+    assert coordinator.update_interval == timedelta(seconds=600)
+
+    # An ez-open is followed by quick polls, bounded by the minimum option.
+    coordinator.async_note_activity()
+    assert coordinator.update_interval == timedelta(seconds=5)
+    remove()
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_skips_poll_while_circuit_is_open(hass):
+    client = DummyClient(io_state={"inputs": {"in1": True}, "outputs": {}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    await coordinator.async_refresh()
+
+    client.io_error = AcogoCircuitOpenError("io_state", 30)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.data.get(input_bit(1)) is True
+    assert not coordinator.is_offline
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_serves_cached_details_without_fetching(hass):
+    cache = AcogoDetailsCache(hass, "entry")
+    cache.async_set("io-1", {"out1Name": "Cached"})
+    client = DummyClient(io_details={"out1Name": "Fresh"})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1", details_cache=cache)
+
+    details = await coordinator.async_get_details()
+
+    assert details == {"out1Name": "Cached"}
+    assert ("io_details", "io-1") not in client.calls
+    assert not coordinator.details_stale
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_revalidation_updates_details_and_listeners(hass):
+    cache = AcogoDetailsCache(hass, "entry")
+    cache.async_set("io-1", {"out1Name": "Old"})
+    client = DummyClient(io_details={"out1Name": "New"})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1", details_cache=cache)
+    await coordinator.async_get_details()
+    updates = []
+    coordinator.async_add_listener(lambda: updates.append(True))
+
+    await coordinator.async_revalidate_details()
+    coordinator._unschedule_refresh()
+
+    assert coordinator.details == {"out1Name": "New"}
+    assert cache.get("io-1") == {"out1Name": "New"}
+    assert updates == [True]
+
+
+@pytest.mark.asyncio
+async def test_details_cache_persists_across_loads(hass, hass_storage):
+    cache = AcogoDetailsCache(hass, "entry")
+    cache.async_set("io-1", {"in1Name": "Door"})
+    await cache._store.async_save(cache._data_to_save())
+    assert "acogo.entry.details" in hass_storage
+
+    reloaded = AcogoDetailsCache(hass, "entry")
+    await reloaded.async_load()
+
+    assert reloaded.get("io-1") == {"in1Name": "Door"}
+    assert not reloaded.is_stale("io-1")
+    assert reloaded.is_stale("io-2")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_io_coordinator_creation_shares_first_fetch(hass):
+    hass.data.setdefault(DOMAIN, {})["entry"] = {}
+    client = DummyClient(io_state={"inputs": {}, "outputs": {}})
+
+    coordinators = await asyncio.gather(
+        *(
+            async_get_or_create_io_coordinator(hass, "entry", client, "io-1")
+            for _ in range(3)
+        )
+    )
+
+    assert coordinators[0] is coordinators[1] is coordinators[2]
+    assert client.calls.count(("io_details", "io-1")) == 1
+    assert client.calls.count(("io_state", "io-1")) == 1
+    assert hass.data[DOMAIN]["entry"]["io_pending"] == {}
+
+
+@pytest.mark.asyncio
+async def test_gate_first_refreshes_are_bounded_by_refresh_semaphore(hass):
+    hass.data.setdefault(DOMAIN, {})["entry"] = {
+        "refresh_semaphore": asyncio.Semaphore(2)
+    }
+    in_flight = 0
+    max_in_flight = 0
+
+    class SlowClient(DummyClient):
+        async def async_get_gate_details(self, device_id: str):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+    client = SlowClient()
+    await asyncio.gather(
+        *(
+            async_get_or_create_gate_coordinator(hass, "entry", client, f"gate-{n}")
+            for n in range(6)
+        )
+    )
+
+    assert len(hass.data[DOMAIN]["entry"]["gate_coordinators"]) == 6
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_only_notifies_on_change(hass):
+    client = DummyClient(io_state={"inputs": {"in1": False, "in2": False}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(coordinator.changed_ports)
+    )
+
+    await coordinator.async_refresh_state()
+    await coordinator.async_refresh_state()
+    client.io_state = {"inputs": {"in1": False, "in2": True}}
+    await coordinator.async_refresh_state()
+    remove()
+
+    assert seen == [None, input_bit(2)]
+    assert coordinator.changed_ports is None
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_notifies_every_port_after_an_error(hass):
+    state = {"inputs": {"in1": False, "in2": False}}
+    client = DummyClient(io_state=state)
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    await coordinator.async_refresh_state()
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(
+            (coordinator.last_update_success, coordinator.changed_ports)
+        )
+    )
+
+    coordinator.async_handle_poll_result(AcogoApiError("boom", status=500))
+    # The same ports as before the failure still bring every entity back.
+    coordinator.async_handle_poll_result(state)
+    remove()
+
+    assert seen == [(False, None), (True, None)]
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_applies_output_optimistically(hass):
+    client = DummyClient(io_state={"outputs": {"out1": False}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    await coordinator.async_refresh_state()
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(coordinator.data.get(output_bit(1)))
+    )
+
+    # The device never switched, so reconciliation reverts the guess.
+    coordinator.async_apply_output(1, True)
+    assert coordinator.data.get(output_bit(1)) is True
+    coordinator.async_confirm_state()
+    await hass.async_block_till_done()
+    remove()
+
+    assert seen == [True, False]
+    assert client.calls.count(("io_state", "io-1")) == 2
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_models_timed_output_expiry(hass):
+    client = DummyClient(io_state={"outputs": {"out1": False}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    coordinator.details = {"out1Time": 5}
+    await coordinator.async_refresh_state()
+
+    client.io_state = {"outputs": {"out1": True}}
+    coordinator.async_apply_output(1, True)
+    coordinator.async_confirm_state()
+    await hass.async_block_till_done()
+    expiry = coordinator.output_expiry(1)
+    assert expiry is not None
+    assert coordinator.data.get(output_bit(1)) is True
+
+    # The device switched the pulse output off by itself.
+    client.io_state = {"outputs": {"out1": False}}
+    async_fire_time_changed(hass, expiry + timedelta(seconds=2))
+    await hass.async_block_till_done()
+
+    assert coordinator.data.get(output_bit(1)) is False
+    assert coordinator.output_expiry(1) is None
+    assert client.calls.count(("io_state", "io-1")) == 3
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_writes_entities_when_expiry_is_rearmed(
+    hass, freezer
+):
+    client = DummyClient(io_state={"outputs": {"out1": True}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    coordinator.details = {"out1Time": 5}
+    await coordinator.async_refresh_state()
+    first = coordinator.output_expiry(1)
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(coordinator.changed_ports)
+    )
+
+    # Switched on again while still on: the state is the same, the expiry not.
+    freezer.tick(timedelta(seconds=1))
+    coordinator.async_apply_output(1, True)
+    remove()
+
+    assert coordinator.output_expiry(1) > first
+    assert seen == [output_bit(1)]
+    await coordinator.async_shutdown()
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from custom_components.acogo.api import AcogoClient
+from custom_components.acogo.fairshare import AcogoRequestScheduler
+from custom_components.acogo.ratelimit import PRIORITY_COMMAND, PRIORITY_POLL
+
+
+class MockResponse:
+    def __init__(self, release: asyncio.Event):
+        self.status = 200
+        self.headers = {}
+        self.content_type = "application/json"
+        self._release = release
+
+    async def json(self):
+        return {"ok": True}
+
+    async def __aenter__(self):
+        await self._release.wait()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class BlockingSession:
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, url))
+        return MockResponse(self.release)
+
+
+async def _hold(scheduler, lane, priority, order, release):
+    async with scheduler.slot(lane, priority):
+        order.append(lane)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_slots_are_capped_and_shared_between_lanes():
+    scheduler = AcogoRequestScheduler(concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    tasks = [asyncio.create_task(_hold(scheduler, "a", PRIORITY_POLL, order, release))]
+    await asyncio.sleep(0)
+    tasks += [
+        asyncio.create_task(_hold(scheduler, lane, PRIORITY_POLL, order, release))
+        for lane in ("a", "a", "a", "b")
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.active == 1
+    assert scheduler.queued == 4
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    # Entry b queued last but is not stuck behind entry a's backlog.
+    assert order == ["a", "b", "a", "a", "a"]
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_jump_other_entries_polls():
+    scheduler = AcogoRequestScheduler(concurrency=1)
+    order = []
+    release = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_hold(scheduler, "big", PRIORITY_POLL, order, release))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    tasks.append(
+        asyncio.create_task(_hold(scheduler, "small", PRIORITY_COMMAND, order, release))
+    )
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert order[:2] == ["big", "small"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slot():
+    scheduler = AcogoRequestScheduler(concurrency=1)
+    order = []
+    release = asyncio.Event()
+    holder = asyncio.create_task(_hold(scheduler, "a", PRIORITY_POLL, order, release))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(
+        _hold(scheduler, "b", PRIORITY_POLL, order, release)
+    )
+    waiting = asyncio.create_task(_hold(scheduler, "c", PRIORITY_POLL, order, release))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(holder, waiting)
+
+    assert order == ["a", "c"]
+    assert scheduler.active == 0
+    assert scheduler.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_clients_share_token_budget_and_global_cap():
+    scheduler = AcogoRequestScheduler(concurrency=1)
+    session = BlockingSession()
+    first = AcogoClient(session, "token", scheduler=scheduler, lane="entry-1")
+    second = AcogoClient(session, "token", scheduler=scheduler, lane="entry-2")
+    other = AcogoClient(session, "other", scheduler=scheduler, lane="entry-3")
+
+    assert first._limiter is second._limiter
+    assert first._limiter is not other._limiter
+
+    requests = [
+        asyncio.create_task(client._request("POST", "/orders"))
+        for client in (first, second)
+    ]
+    await asyncio.sleep(0.01)
+    assert len(session.calls) == 1
+    assert scheduler.as_dict()["queued"] == {"entry-2": 1}
+
+    session.release.set()
+    assert await asyncio.gather(*requests) == [{"ok": True}, {"ok": True}]
+    assert len(session.calls) == 2
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pytest
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.acogo import AcogoCoordinator, _async_remove_devices
+from custom_components.acogo.const import DOMAIN
+from custom_components.acogo.details import AcogoDetailsCache
+from custom_components.acogo.snapshot import IoSnapshot
+from custom_components.acogo.state import AcogoStateStore
+
+
+class DummyClient:
+    def __init__(self, devices):
+        self.devices = devices
+
+    async def async_get_devices(self):
+        return self.devices
+
+
+class DummyCoordinator:
+    def __init__(self):
+        self.shut_down = False
+
+    async def async_shutdown(self):
+        self.shut_down = True
+
+
+@pytest.mark.asyncio
+async def test_device_coordinator_diffs_devices_by_id(hass):
+    client = DummyClient(
+        [
+            {"devId": "gate-1", "model": "acoGO! P"},
+            {"devId": "io-2", "model": "acoGO! I/O"},
+        ]
+    )
+    coordinator = AcogoCoordinator(hass, client)
+    coordinator.devices = [
+        {"devId": "gate-1", "model": "acoGO! P"},
+        {"devId": "io-1", "model": "acoGO! I/O"},
+    ]
+
+    await coordinator._async_update_data()
+
+    assert coordinator.added_devices == [{"devId": "io-2", "model": "acoGO! I/O"}]
+    # A device missing once is kept in case the list was cut short.
+    assert coordinator.removed_devices == []
+    assert [device["devId"] for device in coordinator.devices] == [
+        "gate-1",
+        "io-2",
+        "io-1",
+    ]
+
+    await coordinator._async_update_data()
+
+    assert coordinator.added_devices == []
+    assert coordinator.removed_devices == [{"devId": "io-1", "model": "acoGO! I/O"}]
+    assert coordinator.devices == client.devices
+
+
+@pytest.mark.asyncio
+async def test_device_coordinator_ignores_empty_device_list(hass):
+    client = DummyClient([])
+    coordinator = AcogoCoordinator(hass, client)
+    known = [{"devId": "io-1", "model": "acoGO! I/O"}]
+    coordinator.devices = known
+
+    for _ in range(2):
+        await coordinator._async_update_data()
+
+    assert coordinator.removed_devices == []
+    assert coordinator.devices == known
+
+
+@pytest.mark.asyncio
+async def test_remove_devices_tears_down_coordinators_and_registry(
+    hass, config_entry
+):
+    io_coordinator = DummyCoordinator()
+    cache = AcogoDetailsCache(hass, config_entry.entry_id)
+    cache.async_set("io-1", {"in1Name": "Door"})
+    store = AcogoStateStore(hass, config_entry.entry_id)
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    hass.data[DOMAIN] = {
+        config_entry.entry_id: {
+            "io_coordinators": {"io-1": io_coordinator},
+            "details_cache": cache,
+            "state_store": store,
+        }
+    }
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={(DOMAIN, "io-1")}
+    )
+
+    await _async_remove_devices(hass, config_entry, [{"devId": "io-1"}])
+
+    assert io_coordinator.shut_down
+    assert hass.data[DOMAIN][config_entry.entry_id]["io_coordinators"] == {}
+    assert cache.get("io-1") is None
+    assert store.get_io("io-1") is None
+    assert device_registry.async_get_device(identifiers={(DOMAIN, "io-1")}) is None
@@ -0,0 +1,129 @@
+import pytest
+
+from custom_components.acogo.api import AcogoApiError, AcogoClient
+from custom_components.acogo.const import DOMAIN
+from custom_components.acogo.diagnostics import async_get_config_entry_diagnostics
+from custom_components.acogo.metrics import (
+    AcogoMetrics,
+    ConnectionStats,
+    LatencyHistogram,
+)
+from custom_components.acogo.session import POOL_LIMIT_PER_HOST
+
+
+class MockResponse:
+    def __init__(self, status, json_data=None, text_data=""):
+        self.status = status
+        self.headers = {}
+        self.content_type = "application/json"
+        self._json_data = json_data
+        self._text_data = text_data
+
+    async def json(self):
+        return self._json_data
+
+    async def text(self):
+        return self._text_data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class MockSession:
+    def __init__(self, response_or_factory):
+        self._response_or_factory = response_or_factory
+
+    def request(self, method, url, headers=None, **kwargs):
+        if callable(self._response_or_factory):
+            return self._response_or_factory(method, url, headers or {}, **kwargs)
+        return self._response_or_factory
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = LatencyHistogram()
+    for seconds in (0.01, 0.02, 0.2, 0.3, 20.0):
+        histogram.observe(seconds)
+
+    assert histogram.total == 5
+    assert histogram.percentile(0.4) == 0.05
+    assert histogram.percentile(0.8) == 0.5
+    assert histogram.percentile(1.0) == 10.0
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_metrics_aggregate_across_families():
+    metrics = AcogoMetrics()
+    metrics.request_started("io_state")
+    assert metrics.in_flight == 1
+    metrics.request_finished("io_state", 0.1, 200)
+    metrics.request_started("gate_details")
+    metrics.request_finished("gate_details", 0.2, 503)
+    metrics.request_started("gate_details")
+    metrics.request_finished("gate_details", 10.0, "timeout")
+    metrics.record("gate_details", "circuit_open")
+
+    assert metrics.in_flight == 0
+    assert metrics.total_requests == 3
+    assert metrics.errors == 2
+    assert metrics.count("circuit_open") == 1
+    assert metrics.latency().total == 3
+    assert metrics.as_dict()["gate_details"]["statuses"] == {
+        "503": 1,
+        "timeout": 1,
+        "circuit_open": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_client_records_status_per_endpoint_family():
+    def factory(method, url, headers, **kwargs):
+        if url.endswith("/state"):
+            return MockResponse(408, text_data="offline")
+        return MockResponse(200, json_data=[])
+
+    client = AcogoClient(MockSession(factory), "token")
+
+    await client.async_get_devices()
+    with pytest.raises(AcogoApiError):
+        await client.async_get_io_state("io-1")
+
+    assert client.metrics.endpoint("devices").statuses == {200: 1}
+    assert client.metrics.endpoint("io_state").statuses == {408: 1}
+    assert client.metrics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_redact_token(hass, config_entry):
+    client = AcogoClient(MockSession(MockResponse(200, json_data=[])), "token-123")
+    await client.async_get_devices()
+    hass.data[DOMAIN] = {config_entry.entry_id: {"client": client}}
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert result["entry"]["data"]["token"] == "**REDACTED**"
+    assert result["api"]["devices"]["latency"]["count"] == 1
+    assert result["io_coordinators"] == {}
+
+
+@pytest.mark.asyncio
+async def test_connection_stats_report_reuse():
+    stats = ConnectionStats()
+    await stats._on_created(None, None, None)
+    for _ in range(3):
+        await stats._on_reused(None, None, None)
+
+    assert stats.as_dict()["reuse_ratio"] == 0.75
+
+
+@pytest.mark.asyncio
+async def test_dedicated_pool_client_owns_its_session():
+    client = AcogoClient.with_dedicated_pool("token")
+    session = client._session
+
+    assert client.connection_stats is not None
+    assert session.connector.limit_per_host == POOL_LIMIT_PER_HOST
+    await client.async_close()
+    assert session.closed
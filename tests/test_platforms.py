@@ -3,23 +3,34 @@ from __future__ import annotations
 from types import SimpleNamespace
 
 import pytest
+from homeassistant.components.cover import CoverEntityFeature
+from homeassistant.core import State
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from pytest_homeassistant_custom_component.common import mock_restore_cache
 
 from custom_components.acogo import binary_sensor, button, cover
 from custom_components.acogo.binary_sensor import AcogoIoInputSensor
 from custom_components.acogo.button import AcogoOpenGateButton
-from custom_components.acogo.const import DOMAIN
+from custom_components.acogo.commands import AcogoCommandQueue
+from custom_components.acogo.const import DOMAIN, SIGNAL_DEVICES_ADDED
 from custom_components.acogo.cover import AcogoIoOutputCover
+from custom_components.acogo.snapshot import IoSnapshot, input_bit
 
 
 class DummyCoordinator:
     def __init__(self, data=None, offline=False):
-        self.data = data or {}
+        self.data = IoSnapshot.from_payload(data or {})
         self.is_offline = offline
         self.last_update_success = True
         self.refreshed = 0
+        self.activity = 0
+        self.applied = []
+        self.details = None
+        self.changed_ports = None
+        self.restored = False
 
-    def async_add_listener(self, update_callback):
+    def async_add_listener(self, update_callback, context=None):
         return lambda: None
 
     async def async_request_refresh(self):
@@ -28,6 +39,15 @@ class DummyCoordinator:
     async def async_refresh_state(self):
         self.refreshed += 1
 
+    def async_note_activity(self):
+        self.activity += 1
+
+    def async_apply_output(self, out_number, state):
+        self.applied.append((out_number, state))
+
+    def async_confirm_state(self):
+        self.refreshed += 1
+
 
 class DummyClient:
     def __init__(self):
@@ -47,7 +67,11 @@ async def test_button_setup_creates_gate_entity(hass, config_entry, monkeypatch)
         devices=[{"devId": "gate-1", "model": "acoGO! P", "name": "Gate"}]
     )
     hass.data[DOMAIN] = {
-        config_entry.entry_id: {"coordinator": coordinator, "client": client}
+        config_entry.entry_id: {
+            "coordinator": coordinator,
+            "client": client,
+            "command_queue": AcogoCommandQueue(),
+        }
     }
 
     gate_coordinator = DummyCoordinator({})
@@ -79,7 +103,7 @@ async def test_gate_button_unavailable_when_offline():
     coordinator = DummyCoordinator({}, offline=True)
     client = DummyClient()
     entity = AcogoOpenGateButton(
-        coordinator, client, {"devId": "gate-1", "name": "Gate"}
+        coordinator, client, AcogoCommandQueue(), {"devId": "gate-1", "name": "Gate"}
     )
 
     assert not entity.available
@@ -93,7 +117,7 @@ async def test_cover_entity_open_and_close(hass):
     client = DummyClient()
     device = {"devId": "io-1", "name": "Garage", "model": "acoGO! I/O"}
     entity = AcogoIoOutputCover(
-        coordinator, client, device, "Garage", 1, "Output 1", 0
+        coordinator, client, AcogoCommandQueue(), device, "Garage", 1, "Output 1", 0
     )
 
     assert entity.is_closed
@@ -105,6 +129,7 @@ async def test_cover_entity_open_and_close(hass):
         ("set_output", "io-1", 1, True),
         ("set_output", "io-1", 1, False),
     ]
+    assert coordinator.applied == [(1, True), (1, False)]
     assert coordinator.refreshed == 2
 
 
@@ -114,7 +139,7 @@ async def test_cover_entity_with_timed_output_rejects_close():
     client = DummyClient()
     device = {"devId": "io-1", "name": "Garage", "model": "acoGO! I/O"}
     entity = AcogoIoOutputCover(
-        coordinator, client, device, "Garage", 1, "Timed", 5
+        coordinator, client, AcogoCommandQueue(), device, "Garage", 1, "Timed", 5
     )
 
     assert entity.available
@@ -131,7 +156,11 @@ async def test_cover_setup_creates_entities(hass, config_entry, monkeypatch):
         devices=[{"devId": "io-1", "model": "acoGO! I/O", "name": "IO Device"}]
     )
     hass.data[DOMAIN] = {
-        config_entry.entry_id: {"coordinator": coordinator, "client": client}
+        config_entry.entry_id: {
+            "coordinator": coordinator,
+            "client": client,
+            "command_queue": AcogoCommandQueue(),
+        }
     }
 
     io_details = {"out1Name": "Relay 1", "out2Time": 5}
@@ -168,7 +197,11 @@ async def test_binary_sensor_setup_creates_entities(hass, config_entry, monkeypa
         devices=[{"devId": "io-1", "model": "acoGO! I/O", "name": "IO Device"}]
     )
     hass.data[DOMAIN] = {
-        config_entry.entry_id: {"coordinator": coordinator, "client": client}
+        config_entry.entry_id: {
+            "coordinator": coordinator,
+            "client": client,
+            "command_queue": AcogoCommandQueue(),
+        }
     }
 
     io_details = {"in1Name": "Sensor 1"}
@@ -207,3 +240,135 @@ def test_input_sensor_unavailable_when_offline():
 
     assert not entity.available
     assert entity.is_on is False
+
+
+def test_cover_entity_picks_up_revalidated_details(monkeypatch):
+    coordinator = DummyCoordinator({"outputs": {"out1": False}})
+    device = {"devId": "io-1", "name": "Garage", "model": "acoGO! I/O"}
+    entity = AcogoIoOutputCover(
+        coordinator,
+        DummyClient(),
+        AcogoCommandQueue(),
+        device,
+        "Garage",
+        1,
+        "Output 1",
+        0,
+    )
+    monkeypatch.setattr(entity, "async_write_ha_state", lambda: None)
+
+    coordinator.details = {"out1Name": "Gate relay", "out1Time": 3}
+    entity._handle_coordinator_update()
+
+    assert entity.name == "Gate relay"
+    assert entity.supported_features == CoverEntityFeature.OPEN
+
+
+def test_input_sensor_picks_up_revalidated_details(monkeypatch):
+    coordinator = DummyCoordinator({"inputs": {"in1": False}})
+    entity = AcogoIoInputSensor(coordinator, {"devId": "io-1"}, "IO", 1, "Input 1")
+    monkeypatch.setattr(entity, "async_write_ha_state", lambda: None)
+
+    coordinator.details = {"in1Name": "Doorbell"}
+    entity._handle_coordinator_update()
+
+    assert entity.name == "IO - Doorbell"
+
+
+@pytest.mark.asyncio
+async def test_button_setup_adds_entities_for_discovered_devices(
+    hass, config_entry, monkeypatch
+):
+    client = DummyClient()
+    coordinator = SimpleNamespace(devices=[])
+    hass.data[DOMAIN] = {
+        config_entry.entry_id: {
+            "coordinator": coordinator,
+            "client": client,
+            "command_queue": AcogoCommandQueue(),
+        }
+    }
+
+    async def fake_get_or_create_gate_coordinator(*args, **kwargs):
+        return DummyCoordinator({})
+
+    monkeypatch.setattr(
+        button,
+        "async_get_or_create_gate_coordinator",
+        fake_get_or_create_gate_coordinator,
+    )
+
+    entities = []
+    await button.async_setup_entry(
+        hass, config_entry, lambda ents: entities.extend(ents)
+    )
+    assert entities == []
+
+    async_dispatcher_send(
+        hass,
+        SIGNAL_DEVICES_ADDED.format(config_entry.entry_id),
+        [
+            {"devId": "gate-2", "model": "acoGO! Pro", "name": "New gate"},
+            {"devId": "io-9", "model": "acoGO! I/O", "name": "Not a gate"},
+        ],
+    )
+    await hass.async_block_till_done()
+
+    assert [entity.unique_id for entity in entities] == ["gate-2_open_gate"]
+
+
+def test_input_sensor_skips_state_write_for_other_ports(monkeypatch):
+    coordinator = DummyCoordinator({"inputs": {"in1": False, "in2": True}})
+    entity = AcogoIoInputSensor(coordinator, {"devId": "io-1"}, "IO", 1, "Input 1")
+    writes = []
+    monkeypatch.setattr(entity, "async_write_ha_state", lambda: writes.append(1))
+
+    coordinator.changed_ports = input_bit(2)
+    entity._handle_coordinator_update()
+    coordinator.changed_ports = input_bit(1)
+    entity._handle_coordinator_update()
+    coordinator.changed_ports = None
+    entity._handle_coordinator_update()
+
+    assert len(writes) == 2
+
+
+@pytest.mark.asyncio
+async def test_entities_serve_restored_state_until_first_poll(hass):
+    mock_restore_cache(
+        hass,
+        [
+            State("binary_sensor.garage_door", "on"),
+            State("cover.garage_output_1", "open"),
+            State("cover.garage_output_2", "open"),
+        ],
+    )
+    coordinator = DummyCoordinator()
+    coordinator.data = None
+    device = {"devId": "io-1", "name": "Garage", "model": "acoGO! I/O"}
+    sensor = AcogoIoInputSensor(coordinator, device, "Garage", 1, "Door")
+    plain = AcogoIoOutputCover(
+        coordinator, DummyClient(), AcogoCommandQueue(), device, "Garage", 1, "1", 0
+    )
+    timed = AcogoIoOutputCover(
+        coordinator, DummyClient(), AcogoCommandQueue(), device, "Garage", 2, "2", 5
+    )
+    for entity, entity_id in (
+        (sensor, "binary_sensor.garage_door"),
+        (plain, "cover.garage_output_1"),
+        (timed, "cover.garage_output_2"),
+    ):
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_added_to_hass()
+
+    assert sensor.is_on is True
+    assert sensor.extra_state_attributes == {"restored": True}
+    assert plain.is_closed is False
+    assert plain.extra_state_attributes == {"restored": True}
+    # Pulse outputs have switched themselves off since.
+    assert timed.is_closed is True
+
+    coordinator.data = IoSnapshot.from_payload({"inputs": {"in1": False}})
+    assert sensor.is_on is False
+    assert sensor.extra_state_attributes is None
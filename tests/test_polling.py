@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from custom_components.acogo.polling import (
+    ACTIVITY_HALF_LIFE,
+    BOOST_DURATION,
+    HOT_CEILING,
+    HOT_HOLD,
+    WARM_CEILING,
+    AdaptiveInterval,
+    PollTier,
+    TieredInterval,
+    io_interval_from_options,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_interval_backs_off_while_unchanged_up_to_ceiling():
+    interval = AdaptiveInterval(5, 2, 60, clock=FakeClock())
+
+    for _ in range(20):
+        interval.record_unchanged()
+
+    assert interval.current == 60
+
+
+def test_interval_boost_holds_floor_for_boost_duration():
+    clock = FakeClock()
+    interval = AdaptiveInterval(5, 2, 60, clock=clock)
+
+    interval.boost()
+    interval.record_unchanged()
+    assert interval.current == 2
+
+    clock.now += BOOST_DURATION + 1
+    interval.record_unchanged()
+    assert interval.current == 3
+
+
+def test_interval_backs_off_hard_when_offline():
+    interval = AdaptiveInterval(5, 2, 60, clock=FakeClock())
+
+    interval.record_offline()
+    assert interval.current == 20
+
+    interval.record_offline()
+    assert interval.current == 60
+
+
+def test_interval_from_options_uses_configured_bounds():
+    interval = io_interval_from_options(
+        {"io_min_interval": 1, "io_max_interval": 10}, 5
+    )
+
+    assert interval.floor == 1
+    assert interval.ceiling == 10
+    assert interval.current == 5
+
+
+def test_tiered_interval_promotes_on_change_and_cools_down():
+    clock = FakeClock()
+    interval = TieredInterval(5, 2, 120, clock=clock)
+    assert interval.tier is PollTier.COLD
+
+    interval.record_changed()
+    assert interval.tier is PollTier.HOT
+    assert interval.current == 2
+
+    clock.now += HOT_HOLD + 1
+    for _ in range(20):
+        interval.record_unchanged()
+    assert interval.tier is PollTier.WARM
+    assert interval.current == WARM_CEILING
+
+    clock.now += ACTIVITY_HALF_LIFE
+    assert interval.tier is PollTier.COLD
+    assert interval.current == 120
+
+
+def test_tiered_interval_keeps_busy_devices_hot():
+    clock = FakeClock()
+    interval = TieredInterval(5, 2, 120, clock=clock)
+
+    for _ in range(30):
+        interval.record_changed()
+        clock.now += 120
+
+    clock.now += HOT_HOLD
+    for _ in range(20):
+        interval.record_unchanged()
+    assert interval.changes_per_hour >= 6
+    assert interval.tier is PollTier.HOT
+    assert interval.current == HOT_CEILING
+
+
+def test_tiered_interval_does_not_cap_offline_back_off():
+    interval = TieredInterval(5, 2, 120, clock=FakeClock())
+    interval.record_changed()
+
+    for _ in range(3):
+        interval.record_offline()
+
+    assert interval.tier is PollTier.HOT
+    assert interval.current == 120
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+import pytest
+from homeassistant.components import persistent_notification, webhook
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from homeassistant.util.aiohttp import MockRequest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.acogo.gate import AcogoGateCoordinator
+from custom_components.acogo.io import AcogoIoCoordinator
+from custom_components.acogo.push import (
+    PUSH_SAFETY_INTERVAL,
+    PUSH_STALE_AFTER,
+    AcogoPushMonitor,
+    async_apply_push,
+    async_register_webhook,
+)
+from custom_components.acogo.snapshot import input_bit, output_bit
+
+
+class DummyClient:
+    def __init__(self, *, io_state=None, gate_payload=None):
+        self.io_state = io_state or {}
+        self.gate_payload = gate_payload or {}
+        self.calls = []
+
+    async def async_get_io_state(self, device_id: str, fresh: bool = False):
+        self.calls.append(("io_state", device_id))
+        return self.io_state
+
+    async def async_get_gate_details(self, device_id: str):
+        self.calls.append(("gate_details", device_id))
+        return self.gate_payload
+
+
+@pytest.mark.asyncio
+async def test_monitor_stretches_polls_until_pushes_stop(hass):
+    monitor = AcogoPushMonitor(hass)
+    changes = []
+    remove = monitor.async_add_listener(lambda: changes.append(monitor.active))
+
+    assert monitor.stretch(5) == 5
+    monitor.async_record_push()
+    monitor.async_record_push()
+    assert monitor.stretch(5) == PUSH_SAFETY_INTERVAL
+    assert monitor.events == 2
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PUSH_STALE_AFTER + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert changes == [True, False]
+    assert monitor.stretch(5) == 5
+    remove()
+    monitor.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_io_push_is_laid_over_last_state(hass):
+    client = DummyClient(io_state={"inputs": {"in1": False, "in2": False}})
+    monitor = AcogoPushMonitor(hass)
+    coordinator = AcogoIoCoordinator(hass, client, "io-1", push=monitor)
+    await coordinator.async_refresh_state()
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(coordinator.changed_ports)
+    )
+
+    coordinator.async_handle_push({"devId": "io-1", "inputs": {"in2": True}})
+
+    assert seen == [input_bit(2)]
+    assert coordinator.data.get(input_bit(1)) is False
+    assert coordinator.data.get(input_bit(2)) is True
+    assert client.calls == [("io_state", "io-1")]
+
+    coordinator.async_handle_push({"devId": "io-1", "offline": True})
+    assert coordinator.is_offline
+    remove()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_coordinators_follow_push_activity(hass):
+    monitor = AcogoPushMonitor(hass)
+    io = AcogoIoCoordinator(hass, DummyClient(), "io-1", push=monitor)
+    gate = AcogoGateCoordinator(hass, DummyClient(), "gate-1", push=monitor)
+    remove = gate.async_add_listener(lambda: None)
+    fast = io.update_interval
+
+    monitor.async_record_push()
+    assert io.update_interval.total_seconds() == PUSH_SAFETY_INTERVAL
+    assert gate.update_interval.total_seconds() == PUSH_SAFETY_INTERVAL
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PUSH_STALE_AFTER + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert io.update_interval == fast
+    assert gate.update_interval.total_seconds() < PUSH_SAFETY_INTERVAL
+    remove()
+    await io.async_shutdown()
+    await gate.async_shutdown()
+    monitor.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_gate_push_updates_details_and_availability(hass):
+    coordinator = AcogoGateCoordinator(hass, DummyClient(), "gate-1")
+
+    coordinator.async_handle_push({"devId": "gate-1", "details": {"state": "open"}})
+    assert coordinator.data == {"state": "open"}
+    assert coordinator.last_update_success
+
+    coordinator.async_handle_push({"devId": "gate-1", "offline": True})
+    assert coordinator.is_offline
+    assert not coordinator.last_update_success
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_apply_push_routes_events_by_device(hass):
+    client = DummyClient(io_state={"outputs": {"out1": False}})
+    io = AcogoIoCoordinator(hass, client, "io-1")
+    await io.async_refresh_state()
+    entry_data = {"io_coordinators": {"io-1": io}, "gate_coordinators": {}}
+
+    applied = async_apply_push(
+        entry_data,
+        {
+            "events": [
+                {"devId": "io-1", "outputs": {"out1": True}},
+                {"devId": "unknown", "outputs": {"out1": True}},
+                "garbage",
+            ]
+        },
+    )
+
+    assert applied == 1
+    assert io.data.get(output_bit(1)) is True
+    await io.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_webhook_applies_posted_state(hass):
+    assert await async_setup_component(hass, "webhook", {})
+    client = DummyClient(io_state={"inputs": {"in1": False}})
+    monitor = AcogoPushMonitor(hass)
+    io = AcogoIoCoordinator(hass, client, "io-1", push=monitor)
+    await io.async_refresh_state()
+    entry_data = {"io_coordinators": {"io-1": io}, "push": monitor}
+    unregister = async_register_webhook(hass, entry_data, "hook-1")
+    notifications = persistent_notification._async_get_or_create_notifications(hass)
+    assert "/api/webhook/hook-1" in notifications["acogo_webhook_hook-1"]["message"]
+
+    response = await webhook.async_handle_webhook(
+        hass,
+        "hook-1",
+        MockRequest(
+            json.dumps({"devId": "io-1", "inputs": {"in1": True}}).encode(),
+            mock_source="test",
+            method="POST",
+        ),
+    )
+    bad = await webhook.async_handle_webhook(
+        hass, "hook-1", MockRequest(b"not json", mock_source="test", method="POST")
+    )
+
+    assert response.status == 200
+    assert bad.status == 400
+    assert io.data.get(input_bit(1)) is True
+    assert monitor.active
+    unregister()
+    assert "acogo_webhook_hook-1" not in notifications
+    await io.async_shutdown()
+    monitor.async_shutdown()
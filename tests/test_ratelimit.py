@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.acogo.ratelimit import (
+    PRIORITY_COMMAND,
+    PRIORITY_POLL,
+    PRIORITY_SETUP,
+    AcogoRateLimiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_limiter_allows_burst_then_queues():
+    now = [0.0]
+    limiter = AcogoRateLimiter(rate=1000, burst=2, clock=lambda: now[0])
+
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert limiter.queued == 1
+    now[0] += 0.01
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_commands_and_setup_fetches_are_served_before_queued_polls():
+    now = [0.0]
+    limiter = AcogoRateLimiter(rate=200, burst=1, clock=lambda: now[0])
+    await limiter.acquire()
+    order = []
+
+    async def take(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    polls = [
+        asyncio.create_task(take(f"poll-{n}", PRIORITY_POLL)) for n in range(5)
+    ]
+    await asyncio.sleep(0)
+    setup = asyncio.create_task(take("setup", PRIORITY_SETUP))
+    command = asyncio.create_task(take("command", PRIORITY_COMMAND))
+    await asyncio.sleep(0)
+    for _ in range(7):
+        now[0] += 1
+        await asyncio.sleep(0.01)
+    await asyncio.wait_for(asyncio.gather(command, setup, *polls), 1)
+
+    assert order[:2] == ["command", "setup"]
+
+
+@pytest.mark.asyncio
+async def test_pause_holds_every_caller():
+    limiter = AcogoRateLimiter(rate=1000, burst=5)
+    limiter.pause(0.05)
+
+    assert limiter.paused_for > 0
+    waiter = asyncio.create_task(limiter.acquire(PRIORITY_COMMAND))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await asyncio.wait_for(waiter, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_queue():
+    limiter = AcogoRateLimiter(rate=100, burst=1)
+    await limiter.acquire()
+    cancelled = asyncio.create_task(limiter.acquire())
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.wait_for(waiting, 1)
+
+    assert cancelled.cancelled()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.acogo.api import AcogoApiError
+from custom_components.acogo.io import AcogoIoCoordinator
+from custom_components.acogo.scheduler import AcogoIoPollScheduler
+from custom_components.acogo.snapshot import input_bit, output_bit
+
+
+class DummyClient:
+    supports_bulk_io_state = False
+
+    def __init__(self, states=None, errors=None, delay=0.0):
+        self.states = states or {}
+        self.errors = errors or {}
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.paused_for = 0.0
+
+    def circuit_open_for(self, family: str) -> float:
+        return self.paused_for
+
+    async def async_get_io_state(self, device_id: str, fresh: bool = False):
+        self.calls.append(("io_state", device_id))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if device_id in self.errors:
+            raise self.errors[device_id]
+        return self.states.get(device_id, {})
+
+
+class BulkClient(DummyClient):
+    supports_bulk_io_state = True
+
+    async def async_get_io_states(self, device_ids):
+        self.calls.append(("io_states", tuple(device_ids)))
+        return {device_id: self.states[device_id] for device_id in device_ids}
+
+
+def _add_coordinator(hass, client, scheduler, device_id):
+    coordinator = AcogoIoCoordinator(hass, client, device_id, scheduler)
+    coordinator.async_add_listener(lambda: None)
+    scheduler.async_add(coordinator)
+    return coordinator
+
+
+def _make_due(scheduler):
+    for device_id in scheduler._due:
+        scheduler._due[device_id] = 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_polls_all_due_devices_in_one_tick(hass):
+    client = DummyClient(
+        states={
+            "io-1": {"inputs": {"in1": True}, "outputs": {}},
+            "io-2": {"inputs": {}, "outputs": {"out1": True}},
+        }
+    )
+    scheduler = AcogoIoPollScheduler(hass, client)
+    first = _add_coordinator(hass, client, scheduler, "io-1")
+    second = _add_coordinator(hass, client, scheduler, "io-2")
+    _make_due(scheduler)
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert first.update_interval is None
+    assert sorted(client.calls) == [("io_state", "io-1"), ("io_state", "io-2")]
+    assert first.data.get(input_bit(1)) is True
+    assert second.data.get(output_bit(1)) is True
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency(hass):
+    client = DummyClient(delay=0.01)
+    scheduler = AcogoIoPollScheduler(hass, client, concurrency=2)
+    for number in range(6):
+        _add_coordinator(hass, client, scheduler, f"io-{number}")
+    _make_due(scheduler)
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert len(client.calls) == 6
+    assert client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_uses_bulk_endpoint_when_available(hass):
+    client = BulkClient(states={"io-1": {"inputs": {"in1": True}}, "io-2": {}})
+    scheduler = AcogoIoPollScheduler(hass, client)
+    first = _add_coordinator(hass, client, scheduler, "io-1")
+    _add_coordinator(hass, client, scheduler, "io-2")
+    _make_due(scheduler)
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert client.calls == [("io_states", ("io-1", "io-2"))]
+    assert first.data.get(input_bit(1)) is True
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fans_out_offline_and_errors(hass):
+    client = DummyClient(
+        errors={
+            "io-1": AcogoApiError("offline", status=408),
+            "io-2": AcogoApiError("boom", status=500),
+        }
+    )
+    scheduler = AcogoIoPollScheduler(hass, client)
+    offline = _add_coordinator(hass, client, scheduler, "io-1")
+    failing = _add_coordinator(hass, client, scheduler, "io-2")
+    _make_due(scheduler)
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert offline.is_offline
+    assert offline.data.offline
+    assert not failing.last_update_success
+
+
+@pytest.mark.asyncio
+async def test_scheduler_skips_devices_not_due_or_without_listeners(hass):
+    client = DummyClient()
+    scheduler = AcogoIoPollScheduler(hass, client)
+    _add_coordinator(hass, client, scheduler, "io-1")
+    idle = AcogoIoCoordinator(hass, client, "io-2", scheduler)
+    scheduler.async_add(idle)
+    scheduler._due["io-2"] = 0
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_defers_polls_while_circuit_is_open(hass):
+    client = DummyClient()
+    client.paused_for = 30.0
+    scheduler = AcogoIoPollScheduler(hass, client)
+    _add_coordinator(hass, client, scheduler, "io-1")
+    _make_due(scheduler)
+
+    await scheduler.async_tick()
+    scheduler.async_shutdown()
+
+    assert client.calls == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_drops_reads_started_before_a_write(hass):
+    client = DummyClient(states={"io-1": {"outputs": {"out1": False}}}, delay=0.01)
+    scheduler = AcogoIoPollScheduler(hass, client)
+    coordinator = _add_coordinator(hass, client, scheduler, "io-1")
+    coordinator.async_handle_poll_result({"outputs": {"out1": False}})
+    _make_due(scheduler)
+
+    tick = asyncio.create_task(scheduler.async_tick())
+    await asyncio.sleep(0)
+    # The write lands while the tick's read, started before it, is in flight.
+    coordinator.async_apply_output(1, True)
+    await tick
+    scheduler.async_shutdown()
+
+    assert coordinator.data.get(output_bit(1)) is True
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_stops_the_running_tick(hass):
+    client = DummyClient(delay=0.01)
+    scheduler = AcogoIoPollScheduler(hass, client, concurrency=1)
+    for n in range(10):
+        _add_coordinator(hass, client, scheduler, f"io-{n}")
+    _make_due(scheduler)
+    scheduler._schedule()
+
+    await asyncio.sleep(0.015)
+    scheduler.async_shutdown()
+    calls = len(client.calls)
+    await asyncio.sleep(0.05)
+
+    assert calls < 10
+    assert len(client.calls) == calls
+    assert scheduler._tick_task is None
@@ -0,0 +1,135 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.acogo.commands import AcogoCommandQueue
+from custom_components.acogo.const import DOMAIN
+from custom_components.acogo.services import SERVICE_SET_OUTPUTS, async_setup_services
+
+
+class DummyClient:
+    def __init__(self):
+        self.calls = []
+        self.in_flight = {}
+
+    async def async_set_io_output(self, dev_id, out_number, state):
+        self.in_flight[dev_id] = self.in_flight.get(dev_id, 0) + 1
+        assert self.in_flight[dev_id] == 1
+        await asyncio.sleep(0.01)
+        self.in_flight[dev_id] -= 1
+        self.calls.append((dev_id, out_number, state))
+
+
+class DummyIoCoordinator:
+    def __init__(self):
+        self.applied = []
+        self.confirmed = 0
+        self.is_offline = False
+
+    def async_apply_output(self, out_number, state):
+        self.applied.append((out_number, state))
+
+    def async_confirm_state(self):
+        self.confirmed += 1
+
+
+@pytest.fixture
+def entry_data(hass):
+    io_coordinators = {"io-1": DummyIoCoordinator(), "io-2": DummyIoCoordinator()}
+    data = {
+        "coordinator": SimpleNamespace(
+            devices=[
+                {"devId": "io-1", "model": "acoGO! I/O"},
+                {"devId": "io-2", "model": "acoGO! I/O"},
+                {"devId": "gate-1", "model": "acoGO! Pro"},
+            ]
+        ),
+        "client": DummyClient(),
+        "command_queue": AcogoCommandQueue(),
+        "io_coordinators": io_coordinators,
+    }
+    # Domain-wide state that is not an entry must be ignored.
+    hass.data[DOMAIN] = {"entry": data, "shared": object()}
+    async_setup_services(hass)
+    return data
+
+
+@pytest.mark.asyncio
+async def test_set_outputs_writes_each_device_and_confirms_once(hass, entry_data):
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_OUTPUTS,
+        {
+            "devices": [
+                {"device_id": "io-1", "outputs": {"1": True, "2": False, "3": True}},
+                {"device_id": "io-2", "outputs": {4: True}},
+            ]
+        },
+        blocking=True,
+    )
+
+    assert sorted(entry_data["client"].calls) == [
+        ("io-1", 1, True),
+        ("io-1", 2, False),
+        ("io-1", 3, True),
+        ("io-2", 4, True),
+    ]
+    io_1 = entry_data["io_coordinators"]["io-1"]
+    assert io_1.applied == [(1, True), (2, False), (3, True)]
+    assert io_1.confirmed == 1
+    assert entry_data["io_coordinators"]["io-2"].confirmed == 1
+
+
+@pytest.mark.asyncio
+async def test_set_outputs_applies_one_map_to_several_devices(hass, entry_data):
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_OUTPUTS,
+        {"device_id": ["io-1", "io-2"], "outputs": {"1": "on"}},
+        blocking=True,
+    )
+
+    assert sorted(entry_data["client"].calls) == [
+        ("io-1", 1, True),
+        ("io-2", 1, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_set_outputs_rejects_unknown_device(hass, entry_data):
+    with pytest.raises(HomeAssistantError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_OUTPUTS,
+            {"device_id": "io-9", "outputs": {"1": True}},
+            blocking=True,
+        )
+    assert entry_data["client"].calls == []
+
+
+@pytest.mark.asyncio
+async def test_set_outputs_rejects_gates(hass, entry_data):
+    with pytest.raises(HomeAssistantError, match="not an acoGO! I/O"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_OUTPUTS,
+            {"device_id": ["io-1", "gate-1"], "outputs": {"1": True}},
+            blocking=True,
+        )
+    assert entry_data["client"].calls == []
+
+
+@pytest.mark.asyncio
+async def test_set_outputs_skips_offline_devices(hass, entry_data):
+    entry_data["io_coordinators"]["io-2"].is_offline = True
+
+    with pytest.raises(HomeAssistantError, match="io-2"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_OUTPUTS,
+            {"device_id": ["io-1", "io-2"], "outputs": {"1": True}},
+            blocking=True,
+        )
+    assert entry_data["client"].calls == [("io-1", 1, True)]
@@ -0,0 +1,59 @@
+from custom_components.acogo.snapshot import (
+    IoSnapshot,
+    input_bit,
+    iter_outputs,
+    output_bit,
+)
+
+
+def test_snapshot_parses_payload_into_bitmasks():
+    snapshot = IoSnapshot.from_payload(
+        {
+            "message": {
+                "inputs": {"in1": True, "in2": False, "bogus": True},
+                "outputs": {"out3": 1, "out17": True},
+            }
+        }
+    )
+
+    assert snapshot.get(input_bit(1)) is True
+    assert snapshot.get(input_bit(2)) is False
+    assert snapshot.get(input_bit(3)) is None
+    assert snapshot.get(output_bit(3)) is True
+    assert snapshot.inputs == 0b1
+    assert snapshot.outputs == 0b100
+    assert list(iter_outputs(snapshot.known)) == [3]
+    assert not snapshot.offline
+
+
+def test_snapshot_diff_and_equality_ignore_fetch_time():
+    old = IoSnapshot.from_payload({"inputs": {"in1": False}, "outputs": {"out1": True}})
+    new = IoSnapshot.from_payload({"inputs": {"in1": True}, "outputs": {"out1": True}})
+
+    assert old.diff(new) == input_bit(1)
+    assert old.diff(IoSnapshot(old.ports, old.known, fetched_at=0)) == 0
+    assert old == IoSnapshot(old.ports, old.known, fetched_at=0)
+    assert old != new
+    assert old.diff(IoSnapshot.offline_snapshot()) is None
+
+
+def test_snapshot_with_port_sets_and_clears_bits():
+    snapshot = IoSnapshot.from_payload({"outputs": {"out1": False}})
+
+    switched = snapshot.with_port(output_bit(2), True)
+
+    assert switched.get(output_bit(2)) is True
+    assert switched.with_port(output_bit(2), False).get(output_bit(2)) is False
+    assert snapshot.get(output_bit(2)) is None
+    assert switched.as_dict()["outputs"] == {"out1": False, "out2": True}
+
+
+def test_merged_keeps_ports_missing_from_update():
+    base = IoSnapshot.from_payload({"inputs": {"in1": True, "in2": False}})
+    update = IoSnapshot.from_payload({"inputs": {"in2": True}})
+
+    merged = base.merged(update)
+
+    assert merged.get(input_bit(1)) is True
+    assert merged.get(input_bit(2)) is True
+    assert base.diff(merged) == input_bit(2)
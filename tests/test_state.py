@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.acogo.const import DOMAIN
+from custom_components.acogo.details import (
+    AcogoDetailsCache,
+    async_remove_details_cache,
+)
+from custom_components.acogo.gate import async_get_or_create_gate_coordinator
+from custom_components.acogo.io import (
+    AcogoIoCoordinator,
+    async_get_or_create_io_coordinator,
+)
+from custom_components.acogo.scheduler import AcogoIoPollScheduler
+from custom_components.acogo.snapshot import IoSnapshot, input_bit, output_bit
+from custom_components.acogo.state import (
+    STATE_MAX_AGE,
+    AcogoStateStore,
+    async_remove_state_store,
+)
+
+
+class DummyClient:
+    supports_bulk_io_state = False
+
+    def __init__(self, io_state=None, gate_payload=None):
+        self.io_state = io_state or {}
+        self.gate_payload = gate_payload or {}
+        self.calls = []
+
+    def circuit_open_for(self, family: str) -> float:
+        return 0.0
+
+    async def async_get_io_state(self, device_id: str, fresh: bool = False):
+        self.calls.append(("io_state", device_id))
+        return self.io_state
+
+    async def async_get_io_details(self, device_id: str, priority=None):
+        self.calls.append(("io_details", device_id))
+        return {}
+
+    async def async_get_gate_details(self, device_id: str):
+        self.calls.append(("gate_details", device_id))
+        return self.gate_payload
+
+
+@pytest.mark.asyncio
+async def test_state_store_persists_last_good_state(hass, hass_storage):
+    store = AcogoStateStore(hass, "entry")
+    store.async_set_io(
+        "io-1",
+        IoSnapshot.from_payload({"inputs": {"in1": True}}).with_port(
+            input_bit(2), False
+        ),
+    )
+    store.async_set_io("io-2", IoSnapshot.offline_snapshot())
+    store.async_set_gate("gate-1", {"status": "closed"}, time.time())
+    await store._store.async_save(store._data_to_save())
+    assert "acogo.entry.state" in hass_storage
+
+    reloaded = AcogoStateStore(hass, "entry")
+    await reloaded.async_load()
+
+    snapshot = reloaded.get_io("io-1")
+    assert snapshot == store.get_io("io-1")
+    assert snapshot.get(input_bit(1)) is True
+    assert snapshot.get(input_bit(2)) is False
+    # Offline is not a state worth restoring.
+    assert reloaded.get_io("io-2") is None
+    assert reloaded.get_gate("gate-1") == {"status": "closed"}
+
+    reloaded.async_discard("io-1")
+    assert reloaded.get_io("io-1") is None
+
+
+@pytest.mark.asyncio
+async def test_state_store_saves_only_when_state_changes(hass, monkeypatch):
+    store = AcogoStateStore(hass, "entry")
+    saves = []
+    monkeypatch.setattr(
+        store._store, "async_delay_save", lambda *args: saves.append(args)
+    )
+
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    store.async_set_gate("gate-1", {"status": "closed"}, 1.0)
+    store.async_set_gate("gate-1", {"status": "closed"}, 2.0)
+    assert len(saves) == 2
+    # The latest read time is still what the next write records.
+    assert store._data_to_save()["gates"]["gate-1"]["fetched_at"] == 2.0
+
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": False}}))
+    store.async_set_gate("gate-1", {"status": "open"}, 3.0)
+    assert len(saves) == 4
+
+
+@pytest.mark.asyncio
+async def test_closed_stores_do_not_recreate_removed_files(hass, hass_storage):
+    cache = AcogoDetailsCache(hass, "entry")
+    store = AcogoStateStore(hass, "entry")
+    cache.async_set("io-1", {"in1Name": "Door"})
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+
+    await cache.async_close()
+    await store.async_close()
+    assert "acogo.entry.details" in hass_storage
+    assert "acogo.entry.state" in hass_storage
+    await async_remove_details_cache(hass, "entry")
+    await async_remove_state_store(hass, "entry")
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": False}}))
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=5))
+    await hass.async_block_till_done()
+
+    assert "acogo.entry.details" not in hass_storage
+    assert "acogo.entry.state" not in hass_storage
+
+
+@pytest.mark.asyncio
+async def test_io_coordinator_records_read_state_only(hass):
+    store = AcogoStateStore(hass, "entry")
+    client = DummyClient(io_state={"outputs": {"out1": False}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1", state_store=store)
+
+    await coordinator.async_refresh_state()
+    fetched_at = store.get_io("io-1").fetched_at
+    coordinator.async_apply_output(1, True)
+
+    # The optimistic guess is shown but not persisted.
+    assert store.get_io("io-1") == IoSnapshot.from_payload({"outputs": {"out1": False}})
+    assert store.get_io("io-1").fetched_at == fetched_at
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_seeded_io_coordinator_is_marked_until_revalidated(hass):
+    store = AcogoStateStore(hass, "entry")
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    scheduler = AcogoIoPollScheduler(hass, DummyClient())
+    client = DummyClient(io_state={"inputs": {"in1": False}})
+    hass.data.setdefault(DOMAIN, {})["entry"] = {
+        "state_store": store,
+        "io_scheduler": scheduler,
+    }
+
+    coordinator = await async_get_or_create_io_coordinator(
+        hass, "entry", client, "io-1"
+    )
+    await hass.async_block_till_done()
+
+    # No state read at startup; the scheduler reads it back later.
+    assert coordinator.restored
+    assert coordinator.data.get(input_bit(1)) is True
+    assert ("io_state", "io-1") not in client.calls
+    assert scheduler._due["io-1"] > hass.loop.time() - 1
+
+    coordinator.async_handle_poll_result({"inputs": {"in1": False}})
+    assert not coordinator.restored
+    assert coordinator.data.get(input_bit(1)) is False
+    scheduler.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_seeded_io_coordinator_notifies_when_read_back_unchanged(hass):
+    store = AcogoStateStore(hass, "entry")
+    store.async_set_io("io-1", IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    scheduler = AcogoIoPollScheduler(hass, DummyClient())
+    hass.data.setdefault(DOMAIN, {})["entry"] = {
+        "state_store": store,
+        "io_scheduler": scheduler,
+    }
+    coordinator = await async_get_or_create_io_coordinator(
+        hass, "entry", DummyClient(), "io-1"
+    )
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append((coordinator.restored, coordinator.changed_ports))
+    )
+
+    # Every entity is written once, to drop its restored marker.
+    coordinator.async_handle_poll_result({"inputs": {"in1": True}})
+    coordinator.async_handle_poll_result({"inputs": {"in1": True}})
+    remove()
+
+    assert seen == [(False, None)]
+    scheduler.async_shutdown()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_seeded_io_coordinator_without_scheduler_notifies_first_read(hass):
+    client = DummyClient(io_state={"inputs": {"in1": True}})
+    coordinator = AcogoIoCoordinator(hass, client, "io-1")
+    coordinator.async_seed(IoSnapshot.from_payload({"inputs": {"in1": True}}))
+    seen = []
+    remove = coordinator.async_add_listener(
+        lambda: seen.append(coordinator.restored)
+    )
+
+    coordinator.async_start_first_refresh(asyncio.Semaphore(1))
+    await hass.async_block_till_done()
+    remove()
+
+    assert seen == [False]
+    assert not coordinator.always_update
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_seeding_turns_timed_outputs_off(hass):
+    coordinator = AcogoIoCoordinator(hass, DummyClient(), "io-1")
+    coordinator.details = {"out1Time": 5}
+
+    coordinator.async_seed(
+        IoSnapshot.from_payload({"outputs": {"out1": True, "out2": True}})
+    )
+
+    # No expiry survives the restart; the timed output has long switched off.
+    assert coordinator.data.get(output_bit(1)) is False
+    assert coordinator.data.get(output_bit(2)) is True
+    assert coordinator.output_expiry(1) is None
+
+
+@pytest.mark.asyncio
+async def test_state_store_drops_old_states_on_load(hass, hass_storage):
+    now = time.time()
+    old = now - STATE_MAX_AGE.total_seconds() - 60
+    hass_storage["acogo.entry.state"] = {
+        "version": 1,
+        "key": "acogo.entry.state",
+        "data": {
+            "io": {
+                "io-1": {"ports": 1, "known": 1, "fetched_at": now},
+                "io-2": {"ports": 1, "known": 1, "fetched_at": old},
+            },
+            "gates": {"gate-1": {"details": {"status": "ok"}, "fetched_at": old}},
+        },
+    }
+    store = AcogoStateStore(hass, "entry")
+
+    await store.async_load()
+
+    assert store.get_io("io-1") is not None
+    assert store.get_io("io-2") is None
+    assert store.get_gate("gate-1") is None
+
+
+@pytest.mark.asyncio
+async def test_seeded_gate_coordinator_starts_from_stored_details(hass, monkeypatch):
+    monkeypatch.setattr("custom_components.acogo.gate.SEEDED_REFRESH_SPREAD", 0.01)
+    store = AcogoStateStore(hass, "entry")
+    store.async_set_gate("gate-1", {"status": "closed"}, 1234.5)
+    hass.data.setdefault(DOMAIN, {})["entry"] = {"state_store": store}
+    client = DummyClient(gate_payload={"status": "open"})
+
+    coordinator = await async_get_or_create_gate_coordinator(
+        hass, "entry", client, "gate-1"
+    )
+    assert coordinator.restored
+    assert coordinator.data == {"status": "closed"}
+
+    await asyncio.sleep(0.02)
+    await hass.async_block_till_done()
+    assert not coordinator.restored
+    assert coordinator.data == {"status": "open"}
+    assert store.get_gate("gate-1") == {"status": "open"}